@@ -15,6 +15,7 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str
     AZURE_SPEECH_KEY: str = ""
     AZURE_SPEECH_REGION: str = "japaneast"
+    AZURE_MAX_CONCURRENT_STARTS: int = 8
     NOTION_TOKEN: str = ""
     NOTION_DATABASE_ID: str = ""
     YOUTUBE_API_KEY: str = ""
@@ -52,6 +53,14 @@ class Settings(BaseSettings):
     AI_TEMPERATURE: float = 0.7
     STREAM_ENABLED: bool = True  # Enable streaming responses
     
+    # NLP
+    SPACY_BATCH_SIZE: int = 64  # Chunks per nlp.pipe batch
+    
+    # Vocabulary extraction
+    VIDEO_CONCURRENCY: int = 5  # Videos processed at once by batch extraction
+    ENABLE_LOCAL_FASTPATH: bool = False  # Skip the AI when known patterns already cover a transcript
+    LOCAL_HIT_THRESHOLD: int = 5  # Distinct pattern hits needed to take the local fast path
+    
     # Database
     DATABASE_URL: str = "sqlite:///./aivlingual.db"
     
@@ -15,6 +15,7 @@ from app.api.websocket_handler import websocket_router
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.services.database_service import init_db
+from app.services.speech.speech_manager import speech_manager
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +34,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down AIVlingual backend...")
+    speech_manager.shutdown()
 
 
 # Create FastAPI app
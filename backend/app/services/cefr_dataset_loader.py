@@ -11,9 +11,13 @@ from typing import Dict, Optional, Set, List
 import hashlib
 from datetime import datetime
 import os
+import sys
 
 logger = logging.getLogger(__name__)
 
+# CEFR levels as small integer codes (0 = unknown), for ordered comparisons
+CEFR_LEVEL_CODES = {"A1": 1, "A2": 2, "B1": 3, "B2": 4, "C1": 5, "C2": 6}
+
 
 class CEFRDatasetLoader:
     """
@@ -160,57 +164,97 @@ class CEFRDatasetLoader:
         Returns:
             Dictionary with level, source, and confidence
         """
-        word_lower = word.lower()
+        return self.get_cefr_levels([word], [pos])[0]
+    
+    def get_cefr_levels(self, words: List[str], pos_tags: Optional[List[Optional[str]]] = None) -> List[Dict]:
+        """
+        Get CEFR levels for many words in one pass
         
-        # Priority 1: CEFR-J Wordlist (most accurate for Japanese learners)
-        if word_lower in self.cefr_j_wordlist:
-            return {
-                "level": self.cefr_j_wordlist[word_lower]["level"],
-                "source": "cefr_j",
-                "confidence": 0.95,
-                "pos": self.cefr_j_wordlist[word_lower].get("pos", pos)
-            }
+        Args:
+            words: The words to look up
+            pos_tags: Parallel list of parts of speech (optional)
+            
+        Returns:
+            One dictionary with level, level_code, source, and confidence per word
+        """
+        if pos_tags is None:
+            pos_tags = [None] * len(words)
         
-        # Priority 2: Oxford 3000 (essential words)
-        if word_lower in self.oxford_3000:
-            return {
-                "level": self.oxford_3000[word_lower]["cefr"],
-                "source": "oxford_3000",
-                "confidence": 0.90,
-                "rank": self.oxford_3000[word_lower]["rank"],
-                "pos": self.oxford_3000[word_lower]["pos"][0] if self.oxford_3000[word_lower]["pos"] else pos
-            }
+        cefr_j_wordlist = self.cefr_j_wordlist
+        oxford_3000 = self.oxford_3000
+        oxford_5000 = self.oxford_5000
+        word_frequency = self.word_frequency
         
-        # Priority 3: Oxford 5000 (important words)
-        if word_lower in self.oxford_5000:
-            return {
-                "level": self.oxford_5000[word_lower]["cefr"],
-                "source": "oxford_5000",
-                "confidence": 0.85,
-                "rank": self.oxford_5000[word_lower]["rank"],
-                "pos": self.oxford_5000[word_lower]["pos"][0] if self.oxford_5000[word_lower]["pos"] else pos
-            }
+        level_codes = CEFR_LEVEL_CODES
         
-        # Priority 4: Frequency-based estimation
-        freq = self.word_frequency.get(word_lower, 0)
-        if freq > 0:
-            estimated_level = self._estimate_cefr_from_frequency(freq)
-            return {
-                "level": estimated_level,
-                "source": "frequency",
-                "confidence": 0.70,
-                "frequency": freq,
+        results = []
+        append = results.append
+        for word, pos in zip(words, pos_tags):
+            word_lower = word.lower()
+            
+            # Priority 1: CEFR-J Wordlist (most accurate for Japanese learners)
+            entry = cefr_j_wordlist.get(word_lower)
+            if entry is not None:
+                append({
+                    "level": entry["level"],
+                    "level_code": level_codes.get(entry["level"], 0),
+                    "source": "cefr_j",
+                    "confidence": 0.95,
+                    "pos": entry.get("pos", pos)
+                })
+                continue
+            
+            # Priority 2: Oxford 3000 (essential words)
+            entry = oxford_3000.get(word_lower)
+            if entry is not None:
+                append({
+                    "level": entry["cefr"],
+                    "level_code": level_codes.get(entry["cefr"], 0),
+                    "source": "oxford_3000",
+                    "confidence": 0.90,
+                    "rank": entry["rank"],
+                    "pos": entry["pos"][0] if entry["pos"] else pos
+                })
+                continue
+            
+            # Priority 3: Oxford 5000 (important words)
+            entry = oxford_5000.get(word_lower)
+            if entry is not None:
+                append({
+                    "level": entry["cefr"],
+                    "level_code": level_codes.get(entry["cefr"], 0),
+                    "source": "oxford_5000",
+                    "confidence": 0.85,
+                    "rank": entry["rank"],
+                    "pos": entry["pos"][0] if entry["pos"] else pos
+                })
+                continue
+            
+            # Priority 4: Frequency-based estimation
+            freq = word_frequency.get(word_lower, 0)
+            if freq > 0:
+                level = self._estimate_cefr_from_frequency(freq)
+                append({
+                    "level": level,
+                    "level_code": level_codes.get(level, 0),
+                    "source": "frequency",
+                    "confidence": 0.70,
+                    "frequency": freq,
+                    "pos": pos
+                })
+                continue
+            
+            # Default: Make a better guess based on word characteristics
+            level = self._guess_cefr_level(word, pos)
+            append({
+                "level": level,
+                "level_code": level_codes.get(level, 0),
+                "source": "default",
+                "confidence": 0.50,
                 "pos": pos
-            }
+            })
         
-        # Default: Make a better guess based on word characteristics
-        estimated_level = self._guess_cefr_level(word, pos)
-        return {
-            "level": estimated_level,
-            "source": "default",
-            "confidence": 0.50,
-            "pos": pos
-        }
+        return results
     
     def _estimate_cefr_from_frequency(self, frequency: int) -> str:
         """Estimate CEFR level based on word frequency"""
@@ -234,11 +278,13 @@ class CEFRDatasetLoader:
                 reader = csv.DictReader(f)
                 for row in reader:
                     word = row['word'].lower()
+                    # Level/POS/category values repeat across thousands of rows;
+                    # intern them so every entry shares one string object
                     self.cefr_j_wordlist[word] = {
-                        "level": row['cefr_level'],
-                        "pos": row['pos'],
+                        "level": sys.intern(row['cefr_level']),
+                        "pos": sys.intern(row['pos']),
                         "frequency": int(row.get('frequency', 1000)),
-                        "category": row.get('category', 'general'),
+                        "category": sys.intern(row.get('category', 'general')),
                         "japanese": row.get('japanese', '')
                     }
                     # Also update frequency index
@@ -261,17 +307,17 @@ class CEFRDatasetLoader:
                     # Add to appropriate Oxford list based on rank
                     if freq >= 500000:  # Top words -> Oxford 3000
                         self.oxford_3000[word] = {
-                            "cefr": row['estimated_cefr'],
+                            "cefr": sys.intern(row['estimated_cefr']),
                             "rank": len(self.oxford_3000) + 1,
-                            "pos": [row['pos']],
-                            "source": row.get('source', 'frequency')
+                            "pos": [sys.intern(row['pos'])],
+                            "source": sys.intern(row.get('source', 'frequency'))
                         }
                     elif freq >= 100000:  # Common words -> Oxford 5000
                         self.oxford_5000[word] = {
-                            "cefr": row['estimated_cefr'],
+                            "cefr": sys.intern(row['estimated_cefr']),
                             "rank": len(self.oxford_5000) + 3001,
-                            "pos": [row['pos']],
-                            "source": row.get('source', 'frequency')
+                            "pos": [sys.intern(row['pos'])],
+                            "source": sys.intern(row.get('source', 'frequency'))
                         }
         except Exception as e:
             logger.error(f"Error loading frequency CSV: {str(e)}")
@@ -285,10 +331,10 @@ class CEFRDatasetLoader:
                     word = row['word'].lower()
                     # Add to CEFR-J for priority lookup
                     self.cefr_j_wordlist[word] = {
-                        "level": row['cefr_level'],
-                        "pos": row['pos'],
+                        "level": sys.intern(row['cefr_level']),
+                        "pos": sys.intern(row['pos']),
                         "frequency": 5000,  # Medium frequency
-                        "category": row['category'],
+                        "category": sys.intern(row['category']),
                         "japanese": row.get('japanese', ''),
                         "context": row.get('context', '')
                     }
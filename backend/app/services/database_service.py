@@ -3,7 +3,7 @@ Database service for SQLite operations
 """
 
 import aiosqlite
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -173,62 +173,141 @@ class DatabaseService:
             await db.commit()
             return cursor.lastrowid
             
-    async def get_vocabulary_items(
+    async def save_vocabulary_items_bulk(
         self,
-        limit: int = 50,
-        difficulty_level: Optional[int] = None,
+        vocab_items: List[VocabularyModel],
         user_id: Optional[int] = None
-    ) -> List[Dict]:
-        """Get vocabulary items from cache"""
+    ) -> int:
+        """Save several vocabulary items to cache in one transaction"""
+        if not vocab_items:
+            return 0
+        
         async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            
-            # Check if user_id column exists
+            # Check if user_id column exists (after migration)
             cursor = await db.execute("PRAGMA table_info(vocabulary_cache)")
             columns = await cursor.fetchall()
             has_user_id = any(col[1] == 'user_id' for col in columns)
             
-            query = """
-                SELECT * FROM vocabulary_cache
-                WHERE 1=1
-            """
-            params = []
+            rows = [
+                (
+                    item.japanese_text,
+                    item.english_text,
+                    item.context,
+                    item.source_video_id,
+                    item.video_timestamp,
+                    item.difficulty_level,
+                    item.notion_id,
+                    item.synced_at
+                )
+                for item in vocab_items
+            ]
+            
+            if has_user_id and user_id:
+                await db.executemany("""
+                    INSERT OR REPLACE INTO vocabulary_cache 
+                    (japanese_text, english_text, context, source_video_id, 
+                     video_timestamp, difficulty_level, notion_id, synced_at, user_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [row + (user_id,) for row in rows])
+            else:
+                await db.executemany("""
+                    INSERT OR REPLACE INTO vocabulary_cache 
+                    (japanese_text, english_text, context, source_video_id, 
+                     video_timestamp, difficulty_level, notion_id, synced_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
             
-            if has_user_id and user_id is not None:
-                query += " AND user_id = ?"
-                params.append(user_id)
+            await db.commit()
+            return len(rows)
+            
+    @staticmethod
+    def _vocabulary_row_to_item(row: aiosqlite.Row) -> Dict:
+        """Transform a vocabulary_cache row to match frontend expectations"""
+        row_dict = dict(row)
+        return {
+            "id": row_dict["id"],
+            "japanese": row_dict["japanese_text"],
+            "english": row_dict["english_text"],
+            "reading": row_dict.get("reading", ""),
+            "difficulty": row_dict["difficulty_level"],
+            "context": row_dict.get("context", ""),
+            "tags": json.loads(row_dict["tags"]) if row_dict.get("tags") else [],
+            "source": row_dict.get("source", "youtube"),
+            "video_id": row_dict.get("source_video_id"),
+            "timestamp": row_dict.get("video_timestamp"),
+            "notes": row_dict.get("notes", ""),
+            "created_at": row_dict["created_at"]
+        }
+        
+    async def _execute_vocabulary_query(
+        self,
+        db: aiosqlite.Connection,
+        limit: int,
+        difficulty_level: Optional[int],
+        user_id: Optional[int]
+    ) -> aiosqlite.Cursor:
+        """Run the filtered vocabulary_cache query and return its cursor"""
+        # Check if user_id column exists
+        cursor = await db.execute("PRAGMA table_info(vocabulary_cache)")
+        columns = await cursor.fetchall()
+        has_user_id = any(col[1] == 'user_id' for col in columns)
+        
+        query = """
+            SELECT * FROM vocabulary_cache
+            WHERE 1=1
+        """
+        params = []
+        
+        if has_user_id and user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        
+        if difficulty_level is not None:
+            query += " AND difficulty_level = ?"
+            params.append(difficulty_level)
             
-            if difficulty_level is not None:
-                query += " AND difficulty_level = ?"
-                params.append(difficulty_level)
-                
-            query += " ORDER BY created_at DESC LIMIT ?"
-            params.append(limit)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        
+        return await db.execute(query, params)
+            
+    async def get_vocabulary_items(
+        self,
+        limit: int = 50,
+        difficulty_level: Optional[int] = None,
+        user_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Get vocabulary items from cache"""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
             
-            cursor = await db.execute(query, params)
+            cursor = await self._execute_vocabulary_query(db, limit, difficulty_level, user_id)
             rows = await cursor.fetchall()
             
-            # Transform database fields to match frontend expectations
-            items = []
-            for row in rows:
-                row_dict = dict(row)
-                item = {
-                    "id": row_dict["id"],
-                    "japanese": row_dict["japanese_text"],
-                    "english": row_dict["english_text"],
-                    "reading": row_dict.get("reading", ""),
-                    "difficulty": row_dict["difficulty_level"],
-                    "context": row_dict.get("context", ""),
-                    "tags": json.loads(row_dict["tags"]) if row_dict.get("tags") else [],
-                    "source": row_dict.get("source", "youtube"),
-                    "video_id": row_dict.get("source_video_id"),
-                    "timestamp": row_dict.get("video_timestamp"),
-                    "notes": row_dict.get("notes", ""),
-                    "created_at": row_dict["created_at"]
-                }
-                items.append(item)
+            return [self._vocabulary_row_to_item(row) for row in rows]
             
-            return items
+    async def iter_vocabulary_items(
+        self,
+        batch_size: int = 500,
+        limit: int = 1000,
+        difficulty_level: Optional[int] = None,
+        user_id: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Stream vocabulary items in batches from a single query
+        
+        Rows are fetched with ``fetchmany`` so large exports never hold the
+        whole result set in memory at once.
+        """
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            
+            cursor = await self._execute_vocabulary_query(db, limit, difficulty_level, user_id)
+            while True:
+                rows = await cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [self._vocabulary_row_to_item(row) for row in rows]
             
     async def search_vocabulary(self, search_term: str) -> List[Dict]:
         """Search vocabulary items"""
@@ -6,7 +6,7 @@ Supports Anki deck and CSV formats
 import csv
 import json
 import io
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, List, Optional, TextIO
 from datetime import datetime
 import logging
 import zipfile
@@ -16,6 +16,181 @@ from app.models.vocabulary import VocabularyModel
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched from the database per round-trip while exporting
+EXPORT_BATCH_SIZE = 500
+
+# Styling for the Basic note type used in exported Anki decks
+_ANKI_BASIC_CSS = """
+.card {
+    font-family: 'Noto Sans JP', sans-serif;
+    font-size: 20px;
+    text-align: center;
+    color: #333;
+}
+
+.japanese {
+    font-size: 30px;
+    font-weight: bold;
+    margin-bottom: 10px;
+}
+
+.reading {
+    font-size: 18px;
+    color: #666;
+    margin-bottom: 15px;
+}
+
+.context {
+    font-size: 16px;
+    color: #888;
+    font-style: italic;
+    margin-bottom: 20px;
+}
+
+.english {
+    font-size: 24px;
+    color: #2196F3;
+    margin-bottom: 15px;
+}
+
+.difficulty {
+    font-size: 14px;
+    color: #666;
+}
+
+.source {
+    font-size: 14px;
+    margin-top: 20px;
+}
+
+.source a {
+    color: #2196F3;
+    text-decoration: none;
+}
+"""
+
+# Static note type definitions shared by every Anki export (do not mutate)
+_ANKI_MODELS = {
+    "1": {
+        "id": 1,
+        "name": "Basic",
+        "type": 0,
+        "flds": [
+            {"name": "Front", "ord": 0},
+            {"name": "Back", "ord": 1}
+        ],
+        "tmpls": [{
+            "name": "Card 1",
+            "qfmt": "{{Front}}",
+            "afmt": "{{FrontSide}}<hr id=answer>{{Back}}"
+        }],
+        "css": _ANKI_BASIC_CSS
+    }
+}
+
+# _ANKI_MODELS never changes, so serialize it once and splice it into each export
+_ANKI_MODELS_JSON = json.dumps(_ANKI_MODELS)
+
+
+def _build_anki_note(deck_id: int, idx: int, item: Dict, mod_ts: int) -> Dict:
+    """Build the Anki note for one vocabulary item"""
+    get = item.get
+    note_id = deck_id + idx + 1
+    
+    # Create card front (Japanese with context)
+    front = f"""<div class='japanese'>{get('japanese_text', '')}</div>
+<div class='reading'>{get('reading', '')}</div>
+<div class='context'>{get('context', '')}</div>"""
+    
+    # Create card back (English with additional info)
+    back = f"""<div class='english'>{get('english_text', '')}</div>
+<div class='difficulty'>Difficulty: {get('difficulty_level', 'N/A')}</div>"""
+    
+    video_id = get('source_video_id')
+    if video_id:
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
+        video_timestamp = get('video_timestamp')
+        if video_timestamp:
+            video_url += f"&t={int(video_timestamp)}s"
+        back += f"\n<div class='source'><a href='{video_url}'>Source Video</a></div>"
+    
+    return {
+        "id": note_id,
+        "guid": f"aivlingual_{note_id}",
+        "mid": 1,  # Model ID (basic model)
+        "mod": mod_ts,
+        "usn": -1,
+        "tags": ["AIVlingual", f"N{get('difficulty_level', 3)}"],
+        "flds": [front, back],
+        "sfld": get('japanese_text', ''),
+        "csum": 0,
+        "flags": 0,
+        "data": ""
+    }
+
+
+def _build_anki_card(note: Dict, idx: int, deck_id: int, mod_ts: int) -> Dict:
+    """Build the new-card entry scheduling a note"""
+    note_id = note["id"]
+    return {
+        "id": note_id + 1000000,
+        "nid": note_id,
+        "did": deck_id,
+        "ord": 0,
+        "mod": mod_ts,
+        "usn": -1,
+        "type": 0,
+        "queue": 0,
+        "due": idx,
+        "ivl": 0,
+        "factor": 2500,
+        "reps": 0,
+        "lapses": 0,
+        "left": 2500,
+        "odue": 0,
+        "odid": 0,
+        "flags": 0,
+        "data": ""
+    }
+
+
+def _serialize_anki_collection(decks: Dict, notes: List[Dict], cards: List[Dict]) -> str:
+    """
+    Serialize an Anki collection, reusing the pre-encoded static models
+    
+    Produces the same text as ``json.dumps`` on the full collection dict.
+    """
+    return (
+        '{"decks": ' + json.dumps(decks)
+        + ', "notes": ' + json.dumps(notes)
+        + ', "cards": ' + json.dumps(cards)
+        + ', "models": ' + _ANKI_MODELS_JSON + '}'
+    )
+
+
+def _write_csv_rows(output: TextIO, writer, rows: Iterable[List]) -> None:
+    """
+    Write CSV rows, skipping the csv quoting machinery for rows that need none
+    
+    A row is safe when no field contains a delimiter, quote or line break; it
+    is then emitted as a plain join. Anything else goes through ``writer``,
+    which must be a default ``csv.writer`` bound to ``output``.
+    """
+    write = output.write
+    for row in rows:
+        fields = ['' if field is None else str(field) for field in row]
+        line = ','.join(fields)
+        if (
+            len(fields) > 1
+            and line.count(',') == len(fields) - 1
+            and '"' not in line
+            and '\r' not in line
+            and '\n' not in line
+        ):
+            write(line + '\r\n')
+        else:
+            writer.writerow(fields)
+
 
 class ExportService:
     """Handles vocabulary export to various formats"""
@@ -31,15 +206,10 @@ class ExportService:
     ) -> bytes:
         """Export vocabulary to CSV format"""
         try:
-            # Get vocabulary items
-            items = await db_service.get_vocabulary_items(
-                limit=limit,
-                difficulty_level=difficulty_level,
-                user_id=user_id
-            )
-            
-            # Create CSV in memory
-            output = io.StringIO()
+            # Create CSV in memory, encoding as UTF-8 with BOM (for Excel
+            # compatibility) while writing instead of copying at the end
+            buffer = io.BytesIO()
+            output = io.TextIOWrapper(buffer, encoding='utf-8-sig', newline='', write_through=True)
             writer = csv.writer(output)
             
             # Write header
@@ -55,9 +225,14 @@ class ExportService:
                 'Created Date'
             ])
             
-            # Write data
-            for item in items:
-                writer.writerow([
+            # Write data batch by batch as it streams from the database
+            async for batch in db_service.iter_vocabulary_items(
+                batch_size=EXPORT_BATCH_SIZE,
+                limit=limit,
+                difficulty_level=difficulty_level,
+                user_id=user_id
+            ):
+                _write_csv_rows(output, writer, ([
                     item.get('japanese', ''),
                     item.get('english', ''),
                     item.get('reading', ''),
@@ -67,11 +242,10 @@ class ExportService:
                     item.get('video_id', ''),
                     item.get('timestamp', ''),
                     item.get('created_at', '')
-                ])
+                ] for item in batch))
             
-            # Convert to bytes
-            csv_content = output.getvalue()
-            return csv_content.encode('utf-8-sig')  # UTF-8 with BOM for Excel compatibility
+            output.flush()
+            return buffer.getvalue()
             
         except Exception as e:
             logger.error(f"Error exporting to CSV: {str(e)}")
@@ -86,15 +260,9 @@ class ExportService:
     ) -> bytes:
         """Export vocabulary to Anki deck format (apkg)"""
         try:
-            # Get vocabulary items
-            items = await db_service.get_vocabulary_items(
-                limit=limit,
-                difficulty_level=difficulty_level,
-                user_id=user_id
-            )
-            
             # Create Anki deck structure
             deck_id = int(datetime.now().timestamp() * 1000)
+            mod_ts = int(datetime.now().timestamp())
             
             # Create deck info
             deck_info = {
@@ -110,138 +278,32 @@ class ExportService:
                 "revToday": [0, 0],
                 "lrnToday": [0, 0],
                 "id": deck_id,
-                "mod": int(datetime.now().timestamp())
+                "mod": mod_ts
             }
             
-            # Create notes
+            # Create notes, numbering them across streamed batches
             notes = []
-            for idx, item in enumerate(items):
-                note_id = deck_id + idx + 1
-                
-                # Create card front (Japanese with context)
-                front = f"""<div class='japanese'>{item.get('japanese_text', '')}</div>
-<div class='reading'>{item.get('reading', '')}</div>
-<div class='context'>{item.get('context', '')}</div>"""
-                
-                # Create card back (English with additional info)
-                back = f"""<div class='english'>{item.get('english_text', '')}</div>
-<div class='difficulty'>Difficulty: {item.get('difficulty_level', 'N/A')}</div>"""
-                
-                if item.get('source_video_id'):
-                    video_url = f"https://www.youtube.com/watch?v={item['source_video_id']}"
-                    if item.get('video_timestamp'):
-                        video_url += f"&t={int(item['video_timestamp'])}s"
-                    back += f"\n<div class='source'><a href='{video_url}'>Source Video</a></div>"
-                
-                note = {
-                    "id": note_id,
-                    "guid": f"aivlingual_{note_id}",
-                    "mid": 1,  # Model ID (basic model)
-                    "mod": int(datetime.now().timestamp()),
-                    "usn": -1,
-                    "tags": [f"AIVlingual", f"N{item.get('difficulty_level', 3)}"],
-                    "flds": [front, back],
-                    "sfld": item.get('japanese_text', ''),
-                    "csum": 0,
-                    "flags": 0,
-                    "data": ""
-                }
-                notes.append(note)
+            async for batch in db_service.iter_vocabulary_items(
+                batch_size=EXPORT_BATCH_SIZE,
+                limit=limit,
+                difficulty_level=difficulty_level,
+                user_id=user_id
+            ):
+                notes.extend([
+                    _build_anki_note(deck_id, idx, item, mod_ts)
+                    for idx, item in enumerate(batch, start=len(notes))
+                ])
             
-            # Create collection structure
-            collection = {
-                "decks": {str(deck_id): deck_info},
-                "notes": notes,
-                "cards": [],
-                "models": {
-                    "1": {
-                        "id": 1,
-                        "name": "Basic",
-                        "type": 0,
-                        "flds": [
-                            {"name": "Front", "ord": 0},
-                            {"name": "Back", "ord": 1}
-                        ],
-                        "tmpls": [{
-                            "name": "Card 1",
-                            "qfmt": "{{Front}}",
-                            "afmt": "{{FrontSide}}<hr id=answer>{{Back}}"
-                        }],
-                        "css": """
-.card {
-    font-family: 'Noto Sans JP', sans-serif;
-    font-size: 20px;
-    text-align: center;
-    color: #333;
-}
-
-.japanese {
-    font-size: 30px;
-    font-weight: bold;
-    margin-bottom: 10px;
-}
-
-.reading {
-    font-size: 18px;
-    color: #666;
-    margin-bottom: 15px;
-}
-
-.context {
-    font-size: 16px;
-    color: #888;
-    font-style: italic;
-    margin-bottom: 20px;
-}
-
-.english {
-    font-size: 24px;
-    color: #2196F3;
-    margin-bottom: 15px;
-}
-
-.difficulty {
-    font-size: 14px;
-    color: #666;
-}
-
-.source {
-    font-size: 14px;
-    margin-top: 20px;
-}
-
-.source a {
-    color: #2196F3;
-    text-decoration: none;
-}
-"""
-                    }
-                }
-            }
+            # Create a card for each note
+            cards = [
+                _build_anki_card(note, idx, deck_id, mod_ts)
+                for idx, note in enumerate(notes)
+            ]
             
-            # Create cards for each note
-            for idx, note in enumerate(notes):
-                card = {
-                    "id": note["id"] + 1000000,
-                    "nid": note["id"],
-                    "did": deck_id,
-                    "ord": 0,
-                    "mod": int(datetime.now().timestamp()),
-                    "usn": -1,
-                    "type": 0,
-                    "queue": 0,
-                    "due": idx,
-                    "ivl": 0,
-                    "factor": 2500,
-                    "reps": 0,
-                    "lapses": 0,
-                    "left": 2500,
-                    "odue": 0,
-                    "odid": 0,
-                    "flags": 0,
-                    "data": ""
-                }
-                collection["cards"].append(card)
+            # Create collection structure
+            collection_json = _serialize_anki_collection(
+                {str(deck_id): deck_info}, notes, cards
+            )
             
             # Create media info
             media = {}  # No media files for now
@@ -251,7 +313,7 @@ class ExportService:
             
             with zipfile.ZipFile(apkg_buffer, 'w', zipfile.ZIP_DEFLATED) as apkg:
                 # Add collection
-                apkg.writestr("collection.anki2", json.dumps(collection))
+                apkg.writestr("collection.anki2", collection_json)
                 
                 # Add media
                 apkg.writestr("media", json.dumps(media))
@@ -278,11 +340,14 @@ class ExportService:
         """Export vocabulary to JSON format"""
         try:
             # Get vocabulary items
-            items = await db_service.get_vocabulary_items(
+            items = []
+            async for batch in db_service.iter_vocabulary_items(
+                batch_size=EXPORT_BATCH_SIZE,
                 limit=limit,
                 difficulty_level=difficulty_level,
                 user_id=user_id
-            )
+            ):
+                items.extend(batch)
             
             # Create export data
             export_data = {
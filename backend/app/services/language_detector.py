@@ -4,6 +4,7 @@ Language detection service for real-time speech recognition
 
 import re
 import logging
+from functools import lru_cache
 from typing import Dict, Tuple, Optional
 from collections import Counter
 
@@ -13,6 +14,12 @@ logger = logging.getLogger(__name__)
 class LanguageDetector:
     """Advanced language detection for speech recognition results"""
     
+    # Polite/plain sentence endings, checked with a single str.endswith call
+    _JP_ENDINGS = ('です', 'ます', 'だ')
+    
+    # Texts up to this length are checked for a single script before full analysis
+    _FAST_PATH_MAX_LENGTH = 32
+    
     def __init__(self):
         # Japanese character ranges
         self.hiragana_range = (0x3040, 0x309F)
@@ -20,15 +27,18 @@ class LanguageDetector:
         self.kanji_range = (0x4E00, 0x9FAF)
         
         # Common Japanese particles and words
-        self.japanese_particles = {'は', 'が', 'を', 'に', 'で', 'と', 'も', 'や', 'の', 'か', 'ね', 'よ'}
-        self.japanese_common = {'です', 'ます', 'だ', 'である', 'でした', 'ました'}
+        self.japanese_particles = frozenset({'は', 'が', 'を', 'に', 'で', 'と', 'も', 'や', 'の', 'か', 'ね', 'よ'})
+        self.japanese_common = frozenset({'です', 'ます', 'だ', 'である', 'でした', 'ました'})
         
         # Common English words
-        self.english_common = {
+        self.english_common = frozenset({
             'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 
             'i', 'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 
             'do', 'at', 'this', 'but', 'his', 'by', 'from'
-        }
+        })
+        
+        # Word tokenizer: runs of anything but whitespace and Japanese punctuation
+        self._word_re = re.compile(r'[^\s、。！？]+')
         
         # Vtuber-specific mixed language patterns
         self.vtuber_patterns = {
@@ -36,6 +46,12 @@ class LanguageDetector:
             'mixed_thanks': r'(thank you|thanks).*?(ありがとう|あり)',
             'mixed_gaming': r'(gg|good game|nice).*?(ナイス|いいね)',
         }
+        # Compiled once; callers pass lowercased text so no IGNORECASE is needed
+        self._vtuber_res = [re.compile(pattern) for pattern in self.vtuber_patterns.values()]
+        
+        # Speech recognition re-sends overlapping partial results, so memoize
+        # per instance (a module-level cache would pin this detector forever)
+        self._detect_language_cached = lru_cache(maxsize=512)(self._detect_language)
     
     def detect_language(self, text: str, browser_hint: Optional[str] = None) -> Tuple[str, float]:
         """
@@ -46,9 +62,19 @@ class LanguageDetector:
             language_code: 'ja-JP', 'en-US', or 'mixed'
             confidence: 0.0 to 1.0
         """
+        return self._detect_language_cached(text, browser_hint)
+    
+    def _detect_language(self, text: str, browser_hint: Optional[str]) -> Tuple[str, float]:
+        """Uncached implementation of detect_language"""
         if not text:
             return browser_hint or 'ja-JP', 0.0
         
+        # Fast path for short single-script utterances
+        if len(text) <= self._FAST_PATH_MAX_LENGTH:
+            script = self._single_script(text)
+            if script is not None:
+                return script, 0.95
+        
         text_lower = text.lower()
         
         # Calculate character type distribution
@@ -82,6 +108,29 @@ class LanguageDetector:
             confidence = min(en_score, 1.0)
             return 'en-US', confidence
     
+    def _single_script(self, text: str) -> Optional[str]:
+        """Return 'ja-JP' or 'en-US' if every non-space character is Japanese or ASCII letters"""
+        japanese = latin = False
+        for char in text:
+            if char.isspace():
+                continue
+            code_point = ord(char)
+            if (self.hiragana_range[0] <= code_point <= self.katakana_range[1] or
+                self.kanji_range[0] <= code_point <= self.kanji_range[1]):
+                japanese = True
+            elif (0x61 <= code_point <= 0x7A) or (0x41 <= code_point <= 0x5A):
+                latin = True
+            else:
+                return None
+            if japanese and latin:
+                return None
+        
+        if japanese:
+            return 'ja-JP'
+        if latin:
+            return 'en-US'
+        return None
+    
     def _analyze_characters(self, text: str) -> Dict[str, float]:
         """Analyze character type distribution"""
         if not text:
@@ -117,8 +166,7 @@ class LanguageDetector:
     def _analyze_words(self, text: str) -> Dict[str, float]:
         """Analyze word-based features"""
         # Split by spaces and common Japanese punctuation
-        words = re.split(r'[\s、。！？]+', text)
-        words = [w for w in words if w]
+        words = self._word_re.findall(text)
         
         if not words:
             return {
@@ -137,7 +185,7 @@ class LanguageDetector:
                 particle_count += 1
                 japanese_word_count += 1
             # Check common Japanese words
-            elif word in self.japanese_common or any(word.endswith(ending) for ending in ['です', 'ます', 'だ']):
+            elif word in self.japanese_common or word.endswith(self._JP_ENDINGS):
                 japanese_word_count += 1
             # Check common English words
             elif word in self.english_common:
@@ -157,25 +205,42 @@ class LanguageDetector:
             'particle_ratio': particle_count / total_words
         }
     
-    def _check_mixed_patterns(self, text: str) -> float:
-        """Check for mixed language patterns common in Vtuber streams"""
+    def _check_mixed_patterns(self, text_lower: str) -> float:
+        """Check for mixed language patterns common in Vtuber streams (expects lowercased text)"""
         mixed_matches = 0
         
-        for pattern_name, pattern in self.vtuber_patterns.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern in self._vtuber_res:
+            if pattern.search(text_lower):
                 mixed_matches += 1
         
         # Check for code-switching indicators
-        if re.search(r'[a-z]+.*?[ぁ-ん]+', text) or re.search(r'[ぁ-ん]+.*?[a-z]+', text):
+        if self._has_latin_and_hiragana(text_lower):
             mixed_matches += 0.5
         
         return min(mixed_matches / 3.0, 1.0)
     
+    @staticmethod
+    def _has_latin_and_hiragana(text_lower: str) -> bool:
+        """Linear scan for both a lowercase ASCII letter and a hiragana character (ぁ-ん)"""
+        has_latin = has_hiragana = False
+        for char in text_lower:
+            code_point = ord(char)
+            if 0x61 <= code_point <= 0x7A:
+                has_latin = True
+            elif 0x3041 <= code_point <= 0x3093:
+                has_hiragana = True
+            else:
+                continue
+            if has_latin and has_hiragana:
+                return True
+        return False
+    
     def get_language_features(self, text: str) -> Dict[str, any]:
         """Get detailed language features for debugging/analysis"""
+        text_lower = text.lower()
         char_stats = self._analyze_characters(text)
-        word_stats = self._analyze_words(text.lower())
-        mixed_score = self._check_mixed_patterns(text.lower())
+        word_stats = self._analyze_words(text_lower)
+        mixed_score = self._check_mixed_patterns(text_lower)
         language, confidence = self.detect_language(text)
         
         return {
@@ -8,17 +8,29 @@ import re
 import json
 import logging
 import hashlib
+import sys
+import time
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import chain, islice
 from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 from datetime import datetime, timedelta
 import asyncio
+import threading
 
 # Optional imports with fallbacks
 try:
+    import numpy as np
     import spacy
+    from spacy.attrs import IS_PUNCT, IS_SPACE, IS_STOP, LENGTH, POS
+    from spacy.matcher import Matcher
+    from spacy.strings import hash_string
+    from spacy.symbols import ADJ, ADV, NOUN, VERB
     SPACY_AVAILABLE = True
 except ImportError:
     SPACY_AVAILABLE = False
     spacy = None
+    Matcher = None
     logging.warning("spaCy not available. Install with: pip install -r requirements-nlp.txt")
 
 # Type checking imports
@@ -38,19 +50,382 @@ except ImportError:
     redis = None
     logging.warning("Redis not available. Caching will be disabled.")
 
-from app.services.cefr_dataset_loader import cefr_loader
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+    xxhash = None
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+    hyperscan = None
+
+from app.services.cefr_dataset_loader import CEFR_LEVEL_CODES, cefr_loader
 from app.services.vocabulary_extractor import VocabularyExtractor
 from app.models.vocabulary import VocabularyModel
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Sentence terminators to split on before batching text through spaCy
+# (Japanese punctuation is often not followed by whitespace)
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[。！？])|(?<=[.!?])\s+|\n+')
+
+# Target size of each chunk fed to nlp.pipe
+SPACY_CHUNK_CHARS = 1000
+
+# Token attributes read in bulk by _extract_important_words, and the
+# universal POS ids of the content words it keeps
+_WORD_FILTER_ATTRS = [IS_PUNCT, IS_STOP, IS_SPACE, LENGTH, POS] if SPACY_AVAILABLE else []
+_CONTENT_POS_IDS = np.array([NOUN, VERB, ADJ, ADV], dtype=np.uint64) if SPACY_AVAILABLE else None
+
+# Lowercase-form hashes of the determiners stripped from the front of noun chunks
+_EN_DETERMINER_HASHES = frozenset(
+    hash_string(word) for word in ('the', 'a', 'an', 'this', 'that', 'these', 'those')
+) if SPACY_AVAILABLE else frozenset()
+
+_A2_CODE = CEFR_LEVEL_CODES["A2"]
+_B1_CODE = CEFR_LEVEL_CODES["B1"]
+
+# Database difficulty (1-5) for CEFR and JLPT levels
+_CEFR_TO_DIFFICULTY = {'A1': 1, 'A2': 2, 'B1': 3, 'B2': 4, 'C1': 5, 'C2': 5}
+_JLPT_TO_DIFFICULTY = {'N5': 1, 'N4': 2, 'N3': 3, 'N2': 4, 'N1': 5}
+
+# Educational priority adjustments used by _calculate_priority
+_TYPE_PRIORITY_BONUS = {
+    'idiom': 3,          # Idioms are high value for language learning
+    'phrasal_verb': 2,   # Phrasal verbs are essential for fluency
+    'collocation': 2,    # Natural word combinations
+}
+_CEFR_PRIORITY_BONUS_EN = {'B1': 2, 'B2': 3, 'C1': 1, 'A1': -2, 'A2': -2}  # A1/A2 are too basic
+# Sort rank of string difficulties (JLPT, or CEFR where C2 ranks above C1)
+_SORT_DIFFICULTY = {'A1': 1, 'A2': 2, 'B1': 3, 'B2': 4, 'C1': 5, 'C2': 6, **_JLPT_TO_DIFFICULTY}
+# Gaming/VTuber context keywords; matched as substrings ("player", "orders"
+# count), all in one precompiled alternation however long the list grows
+_GAMING_KEYWORDS = ('game', 'stream', 'play', 'boss', 'franchise', 'customer', 'order')
+_GAMING_KEYWORDS_RE = re.compile('|'.join(map(re.escape, _GAMING_KEYWORDS)))
+
+# Pipeline components the extraction passes depend on: POS/morphology and
+# lemmas (all passes), the parser for sentences and noun chunks, NER for
+# entities. Anything else a model ships with (e.g. GiNZA's bunsetu
+# recognizer) is disabled after loading.
+_REQUIRED_PIPES = frozenset({
+    "tok2vec", "transformer", "tagger", "morphologizer", "attribute_ruler",
+    "lemmatizer", "parser", "senter", "ner", "compound_splitter"
+})
+
+# 動詞に続く補助動詞（ていく/てくる/ている）
+_JA_AUXILIARY_FORMS = ["ていく", "ていきます", "てくる", "てきます", "ている", "ています"]
+
+# Common idiom patterns + VTuber/Gaming expressions
+# (matched against ASCII-lowercased text, so patterns must be lowercase)
+_EN_IDIOMS = [
+    # Traditional idioms
+    (r"\b(piece of cake)\b", "very easy"),
+    (r"\b(break a leg)\b", "good luck"),
+    (r"\b(hit the books)\b", "study hard"),
+    (r"\b(call it a day)\b", "stop working"),
+    (r"\b(under the weather)\b", "feeling sick"),
+
+    # Gaming/Streaming expressions
+    (r"\b(rage quit)\b", "quit angrily from frustration"),
+    (r"\b(clutch play)\b", "crucial successful play"),
+    (r"\b(throw the game)\b", "intentionally lose"),
+    (r"\b(stream sniper)\b", "viewer who disrupts streams"),
+    (r"\b(backseat gaming)\b", "unwanted advice while playing"),
+    (r"\b(skill issue)\b", "problem due to lack of skill"),
+    (r"\b(touch grass)\b", "go outside/take a break"),
+    (r"\b(no cap)\b", "no lie/for real"),
+    (r"\b(based)\b", "admirable/true to oneself"),
+    (r"\b(cringe)\b", "embarrassing/awkward"),
+    (r"\b(poggers|pog)\b", "awesome/exciting"),
+    (r"\b(copium)\b", "coping/denial"),
+    (r"\b(hopium)\b", "false hope"),
+    (r"\b(throwing hands)\b", "fighting"),
+    (r"\b(down bad)\b", "desperate/struggling"),
+    (r"\b(rent free)\b", "obsessing over something"),
+
+    # Business/work expressions from the video
+    (r"\b(quit (?:my|the) job)\b", "resign from employment"),
+    (r"\b(open(?:ed)? a franchise)\b", "start a franchise business"),
+    (r"\b(mvp today)\b", "most valuable player/person today"),
+    (r"\b(crash(?:ing)? out)\b", "losing control emotionally"),
+    (r"\b(fast food)\b", "quick service restaurant food"),
+    (r"\b(take(?:ing)? (?:the|their) order)\b", "receive customer request"),
+    (r"\b(mess(?:ed)? up)\b", "make a mistake"),
+    (r"\b(stall(?:ing)?)\b", "delay intentionally"),
+]
+_EN_IDIOM_PATTERNS = [(re.compile(pattern), meaning) for pattern, meaning in _EN_IDIOMS]
+
+# Byte table lowercasing A-Z only; unlike str.lower() it never changes string
+# length, so match offsets stay valid in the original text
+_ASCII_LOWER_TABLE = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+
+def _ascii_lower(text: str) -> str:
+    """Lowercase ASCII letters only, leaving every other character untouched"""
+    return text.encode("utf-8").translate(_ASCII_LOWER_TABLE).decode("utf-8")
+
+
+# 日本語の慣用表現パターン
+# VTuberやカジュアルな会話でよく使われる表現
+_JA_IDIOMS = [
+    # 「さあ」で始まる呼びかけ表現
+    (r"(さあ[^。！、]*(?:ましょう|しよう|いこう|いきます))", "invitation/let's go"),
+    (r"(さあ.*やっていきます)", "let's get started"),
+
+    # 感嘆・驚き表現
+    (r"(やばい(?:です)?(?:ね)?)", "oh no/amazing"),
+    (r"(まじ(?:で)?(?:か)?)", "seriously/really"),
+    (r"(すご[いく](?:ない)?)", "amazing/incredible"),
+
+    # 配信でよく使う表現
+    (r"(お疲れ様でした)", "good work/thank you"),
+    (r"(よろしくお願いします)", "please/nice to meet you"),
+    (r"(いらっしゃい(?:ませ)?)", "welcome"),
+
+    # ゲーム実況でよく使う表現
+    (r"(行く[ぞぜ]ー?)", "let's go"),
+    (r"(やった[ぜぞ]?)", "yes!/did it!"),
+    (r"(ナイス(?:です)?)", "nice!"),
+
+    # 困った時の表現
+    (r"(どうしよう)", "what should I do"),
+    (r"(困った(?:な)?)", "I'm in trouble"),
+    (r"(やっちゃった)", "oops/I messed up"),
+
+    # 励まし・応援
+    (r"(頑張[ろれ](?:う)?)", "do your best"),
+    (r"(ファイト(?:だ)?)", "fight/you can do it"),
+
+    # その他のVTuber特有表現
+    (r"(てぇてぇ)", "precious/wholesome"),
+    (r"(草(?:生える)?)", "lol/funny"),
+    (r"(ぽん(?:です)?)", "silly/clumsy"),
+]
+
+
+def _literal_idiom(pattern: str) -> Optional[str]:
+    """Return the literal text of a pattern like ``(お疲れ様でした)``, or None if it uses regex syntax"""
+    if pattern.startswith("(") and pattern.endswith(")"):
+        literal = pattern[1:-1]
+        if literal and re.escape(literal) == literal:
+            return literal
+    return None
+
+
+# Plain-string idioms are located with str.find; the rest need the regex engine
+_JA_LITERAL_IDIOMS = [
+    (_literal_idiom(pattern), meaning) for pattern, meaning in _JA_IDIOMS
+    if _literal_idiom(pattern) is not None
+]
+_JA_REGEX_IDIOMS = [
+    (pattern, meaning) for pattern, meaning in _JA_IDIOMS
+    if _literal_idiom(pattern) is None
+]
+_JA_IDIOM_PATTERNS = [(re.compile(pattern), meaning) for pattern, meaning in _JA_REGEX_IDIOMS]
+
+
+def _group_end(pattern: str, start: int) -> int:
+    """Index of the parenthesis closing the group opened at start"""
+    depth = 0
+    for i in range(start, len(pattern)):
+        if pattern[i] == "(":
+            depth += 1
+        elif pattern[i] == ")":
+            depth -= 1
+            if not depth:
+                return i
+    return len(pattern)
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """
+    Return the longest plain substring every match of an idiom pattern contains
+    
+    Groups, character classes, escapes and optional characters split the
+    pattern into literal runs. Returns None for top-level alternations or
+    patterns with no literal run, which are always treated as candidates.
+    """
+    body = pattern.replace(r"\b", "")
+    # Unwrap the capture group around the whole idiom
+    if body.startswith("(") and _group_end(body, 0) == len(body) - 1:
+        body = body[1:-1]
+    
+    runs = []
+    current = ""
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == "\\":
+            runs.append(current)
+            current = ""
+            i += 2
+            continue
+        if char == "[":
+            runs.append(current)
+            current = ""
+            i = body.index("]", i + 1)
+        elif char == "(":
+            runs.append(current)
+            current = ""
+            i = _group_end(body, i)
+        elif char == "|":
+            return None
+        elif char in "?*":
+            # The preceding character is optional
+            runs.append(current[:-1])
+            current = ""
+        elif char in ".+{":
+            runs.append(current)
+            current = ""
+        else:
+            current += char
+        i += 1
+    runs.append(current)
+    
+    return max(runs, key=len) or None
+
+
+_EN_IDIOM_ANCHORS = [_required_literal(pattern) for pattern, _ in _EN_IDIOMS]
+_JA_IDIOM_ANCHORS = [_required_literal(pattern) for pattern, _ in _JA_REGEX_IDIOMS]
+
+
+def _build_idiom_prefilter(idioms: List[Tuple[str, str]]):
+    """
+    Compile all idiom patterns into one Hyperscan database
+    
+    Hyperscan reports which patterns occur in a single DFA pass; the matching
+    ``re`` patterns are then run to recover exact match text and groups.
+    Returns None when Hyperscan is unavailable or rejects a pattern.
+    """
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    
+    flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+    
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode('utf-8') for pattern, _ in idioms],
+            ids=list(range(len(idioms))),
+            elements=len(idioms),
+            flags=[flags] * len(idioms)
+        )
+        return database
+    except Exception as e:
+        logging.warning(f"Hyperscan idiom prefilter unavailable: {e}")
+        return None
+
+
+def _candidate_idioms(
+    database,
+    idiom_patterns: List[Tuple[re.Pattern, str]],
+    anchors: List[Optional[str]],
+    text: str
+) -> List[Tuple[re.Pattern, str]]:
+    """Return the idiom patterns that can match text, in table order"""
+    if database is None:
+        # Without Hyperscan, only run patterns whose required literal occurs
+        return [
+            idiom for idiom, anchor in zip(idiom_patterns, anchors)
+            if anchor is None or anchor in text
+        ]
+    
+    matched_ids = set()
+    
+    def on_match(idiom_id, start, end, flags, context):
+        matched_ids.add(idiom_id)
+    
+    database.scan(text.encode('utf-8'), match_event_handler=on_match)
+    return [idiom_patterns[idiom_id] for idiom_id in sorted(matched_ids)]
+
+
+_EN_IDIOM_PREFILTER = _build_idiom_prefilter(_EN_IDIOMS)
+_JA_IDIOM_PREFILTER = _build_idiom_prefilter(_JA_REGEX_IDIOMS)
+
+
+def _dump_cache_payload(data: List[Dict]) -> str:
+    """Serialize cached expressions, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data).decode("utf-8")
+    # Compact, and keep Japanese as UTF-8 rather than 6-byte escape sequences
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _load_cache_payload(payload: str) -> List[Dict]:
+    """Deserialize cached expressions"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _priority_sort_key(expr: Dict) -> Tuple[int, int]:
+    """Sort key: priority, then easier expressions first among equals"""
+    diff = expr.get('difficulty', 3)
+    if isinstance(diff, str):
+        # Convert string difficulty to numeric
+        diff = _SORT_DIFFICULTY.get(diff, 3)
+    return expr.get('priority', 5), -diff
+
+
+class _SentenceIndex:
+    """Finds the sentence of a Doc containing a character offset by bisection"""
+    
+    def __init__(self, doc: Doc):
+        self.sentences = list(doc.sents)
+        self.starts = [sent.start_char for sent in self.sentences]
+    
+    def sentence_at(self, char_offset: int) -> Span:
+        return self.sentences[max(bisect_right(self.starts, char_offset) - 1, 0)]
+
+
+class _SpanTexts:
+    """Memoizes sentence and context-window text for one Doc"""
+    
+    def __init__(self, doc: Doc):
+        self.doc = doc
+        self._sentences: Dict[int, str] = {}
+        self._windows: Dict[Tuple[int, int], str] = {}
+    
+    def sentence(self, item) -> str:
+        """Text of the sentence containing a Token or Span"""
+        sent = item.sent
+        text = self._sentences.get(sent.start)
+        if text is None:
+            text = self._sentences[sent.start] = sent.text
+        return text
+    
+    def window(self, start: int, end: int) -> str:
+        """Text of doc[start:end], clamped to the doc"""
+        key = (max(0, start), min(len(self.doc), end))
+        text = self._windows.get(key)
+        if text is None:
+            text = self._windows[key] = self.doc[key[0]:key[1]].text
+        return text
+
 
 class NLPVocabularyExtractor(VocabularyExtractor):
     """
     Enhanced vocabulary extractor using NLP techniques
     """
     
+    # Loaded (nlp_en, nlp_ja) pipelines, shared by every instance
+    _shared_nlp_models: Optional[Tuple] = None
+    # spaCy runs in worker threads; serialize use of the shared pipelines
+    _nlp_lock = threading.Lock()
+    
     def __init__(self):
         super().__init__()
         
@@ -82,6 +457,19 @@ class NLPVocabularyExtractor(VocabularyExtractor):
             "old", "right", "big", "high", "different", "small", "large", "next", "early",
             "yes", "no", "thank", "thanks", "sorry", "hello", "hi", "bye", "please"
         }
+        
+        # StringStore hashes of the skip words in their common casings, so
+        # tokens can be checked by their integer lemma without building strings
+        self._skip_word_hashes = frozenset(
+            hash_string(variant)
+            for word in self.skip_words
+            for variant in (word, word.capitalize(), word.upper())
+        ) if SPACY_AVAILABLE else frozenset()
+        
+        # Token pattern matchers for multi-word expressions
+        self.en_matcher = None
+        self.ja_matcher = None
+        self._initialize_matchers()
     
     def _initialize_nlp_models(self):
         """Initialize spaCy models if available"""
@@ -89,6 +477,11 @@ class NLPVocabularyExtractor(VocabularyExtractor):
             logger.warning("spaCy not available, using pattern-based extraction only")
             return
         
+        # Reuse pipelines already loaded by another instance
+        if NLPVocabularyExtractor._shared_nlp_models is not None:
+            self.nlp_en, self.nlp_ja = NLPVocabularyExtractor._shared_nlp_models
+            return
+        
         try:
             # Try to load English model - Method 1: Direct import
             for model_name in ["en_core_web_lg", "en_core_web_sm"]:
@@ -152,11 +545,53 @@ class NLPVocabularyExtractor(VocabularyExtractor):
                 
                 if self.nlp_ja is None:
                     logger.error("No Japanese spaCy model could be loaded")
+            
+            for nlp in (self.nlp_en, self.nlp_ja):
+                if nlp is not None:
+                    self._disable_unused_pipes(nlp)
+            
+            NLPVocabularyExtractor._shared_nlp_models = (self.nlp_en, self.nlp_ja)
                     
         except Exception:
             logger.exception("Fatal error during NLP model initialization")
             raise  # Re-raise to prevent silent failures
     
+    @staticmethod
+    def _disable_unused_pipes(nlp):
+        """Disable pipeline components whose output no extraction pass reads"""
+        unused = [name for name in nlp.pipe_names if name not in _REQUIRED_PIPES]
+        for name in unused:
+            nlp.disable_pipe(name)
+        if unused:
+            logger.info(f"Disabled unused spaCy components: {', '.join(unused)}")
+    
+    def _initialize_matchers(self):
+        """Build spaCy Matchers for the multi-word expression patterns"""
+        if self.nlp_en is not None:
+            self.en_matcher = Matcher(self.nlp_en.vocab)
+            self.en_matcher.add("PHRASAL_VERB", [[
+                {"POS": "VERB"},
+                {"LOWER": {"IN": sorted(self.phrasal_verb_particles)}}
+            ]])
+        
+        if self.nlp_ja is not None:
+            self.ja_matcher = Matcher(self.nlp_ja.vocab)
+            # 名詞の連続（複合名詞）: 最長一致のみ
+            self.ja_matcher.add("COMPOUND_NOUN", [[
+                {"POS": "NOUN"},
+                {"POS": {"IN": ["NOUN", "PROPN"]}, "OP": "+"}
+            ]], greedy="LONGEST")
+            # 動詞＋ていく/てくる パターン
+            self.ja_matcher.add("VERB_PHRASE", [[
+                {"POS": "VERB"},
+                {"ORTH": {"IN": _JA_AUXILIARY_FORMS}}
+            ]])
+            # 形容詞＋名詞 パターン
+            self.ja_matcher.add("ADJ_NOUN", [[
+                {"POS": "ADJ"},
+                {"POS": "NOUN"}
+            ]])
+    
     def _initialize_cache(self):
         """Initialize Redis cache if available"""
         if not REDIS_AVAILABLE:
@@ -188,9 +623,10 @@ class NLPVocabularyExtractor(VocabularyExtractor):
         """
         # Check cache first
         cache_key = self._generate_cache_key(text, target_language)
-        cached_result = self._get_from_cache(cache_key)
-        if cached_result:
-            return cached_result
+        if self.cache:
+            cached_result = await asyncio.to_thread(self._get_from_cache, cache_key)
+            if cached_result:
+                return cached_result
         
         # Auto-detect language if not specified
         if target_language is None:
@@ -201,7 +637,8 @@ class NLPVocabularyExtractor(VocabularyExtractor):
         # Layer 1: NLP extraction (if available)
         if SPACY_AVAILABLE and ((target_language == 'english' and self.nlp_en) or 
                                (target_language == 'japanese' and self.nlp_ja)):
-            nlp_expressions = self._extract_with_spacy(text, target_language)
+            # spaCy is CPU-bound; keep it off the event loop
+            nlp_expressions = await asyncio.to_thread(self._extract_with_spacy, text, target_language)
             expressions.extend(nlp_expressions)
         
         # Layer 2: Pattern-based extraction (fallback and supplement)
@@ -218,7 +655,8 @@ class NLPVocabularyExtractor(VocabularyExtractor):
         expressions = self._sort_by_priority(expressions)
         
         # Cache results
-        self._save_to_cache(cache_key, expressions)
+        if self.cache:
+            await asyncio.to_thread(self._save_to_cache, cache_key, expressions)
         
         return expressions
     
@@ -234,35 +672,75 @@ class NLPVocabularyExtractor(VocabularyExtractor):
         
         logger.info(f"Processing text with spaCy ({language}), text length: {len(text)}")
         
-        # Process text
-        try:
-            doc = nlp(text)
-            logger.info(f"spaCy processing complete, doc length: {len(doc)} tokens")
-        except Exception:
-            logger.exception("Error in spaCy processing")
-            return expressions
+        # Process text in sentence-aligned chunks so spaCy can batch them
+        chunks = self._split_into_chunks(text)
+        with self._nlp_lock:
+            try:
+                docs = list(nlp.pipe(chunks, batch_size=settings.SPACY_BATCH_SIZE))
+                logger.info(
+                    f"spaCy processing complete, {len(docs)} chunks, "
+                    f"{sum(len(doc) for doc in docs)} tokens"
+                )
+            except Exception:
+                logger.exception("Error in spaCy processing")
+                return expressions
+            
+            # Shared across chunks so a word is reported once per text, not per chunk
+            seen_lemmas: Set[str] = set()
+            for doc in docs:
+                expressions.extend(self._extract_from_doc(doc, language, seen_lemmas))
+        
+        logger.info(f"Total expressions extracted with spaCy: {len(expressions)}")
+        return expressions
+    
+    @staticmethod
+    def _split_into_chunks(text: str, max_chars: int = SPACY_CHUNK_CHARS) -> List[str]:
+        """Split text at sentence boundaries into chunks of roughly max_chars"""
+        chunks = []
+        start = 0
+        last_boundary = 0
+        
+        for match in _SENTENCE_BOUNDARY_RE.finditer(text):
+            # Cut at the previous boundary once this sentence would overflow
+            if match.start() - start > max_chars and last_boundary > start:
+                chunks.append(text[start:last_boundary])
+                start = last_boundary
+            last_boundary = match.end()
+        
+        if len(text) - start > max_chars and last_boundary > start:
+            chunks.append(text[start:last_boundary])
+            start = last_boundary
+        chunks.append(text[start:])
+        
+        return [chunk.strip() for chunk in chunks if chunk.strip()]
+    
+    def _extract_from_doc(self, doc: Doc, language: str, seen_lemmas: Set[str]) -> List[Dict]:
+        """Run every spaCy-based extraction pass over a single processed doc"""
+        expressions = []
+        # Sentence/context strings shared by the passes below
+        texts = _SpanTexts(doc)
         
         # Extract various types of expressions
         # 1. Multi-word expressions (phrasal verbs, collocations)
         try:
-            multi_word_exprs = self._extract_multiword_expressions(doc, language)
-            logger.info(f"Multi-word expressions: {len(multi_word_exprs)}")
+            multi_word_exprs = self._extract_multiword_expressions(doc, language, texts)
+            logger.debug(f"Multi-word expressions: {len(multi_word_exprs)}")
             expressions.extend(multi_word_exprs)
         except Exception:
             logger.exception("Error in _extract_multiword_expressions")
         
         # 2. Named entities (useful for context)
         try:
-            entities = self._extract_entities(doc, language)
-            logger.info(f"Named entities: {len(entities)}")
+            entities = self._extract_entities(doc, language, texts)
+            logger.debug(f"Named entities: {len(entities)}")
             expressions.extend(entities)
         except Exception:
             logger.exception("Error in _extract_entities")
         
         # 3. Important single words (based on POS and frequency)
         try:
-            single_words = self._extract_important_words(doc, language)
-            logger.info(f"Important single words: {len(single_words)}")
+            single_words = self._extract_important_words(doc, language, texts, seen_lemmas)
+            logger.debug(f"Important single words: {len(single_words)}")
             expressions.extend(single_words)
         except Exception:
             logger.exception("Error in _extract_important_words")
@@ -270,67 +748,53 @@ class NLPVocabularyExtractor(VocabularyExtractor):
         # 4. Idiomatic expressions
         try:
             idioms = self._extract_idioms(doc, language)
-            logger.info(f"Idiomatic expressions: {len(idioms)}")
+            logger.debug(f"Idiomatic expressions: {len(idioms)}")
             expressions.extend(idioms)
         except Exception:
             logger.exception("Error in _extract_idioms")
         
-        logger.info(f"Total expressions extracted with spaCy: {len(expressions)}")
         return expressions
     
-    def _extract_multiword_expressions(self, doc: Doc, language: str) -> List[Dict]:
+    def _extract_multiword_expressions(self, doc: Doc, language: str, texts: _SpanTexts) -> List[Dict]:
         """Extract phrasal verbs, collocations, and other multi-word expressions"""
         expressions = []
         
         if language == 'english':
             # Phrasal verbs
-            for token in doc:
-                if token.pos_ == "VERB" and token.i + 1 < len(doc):
-                    next_token = doc[token.i + 1]
-                    if next_token.text.lower() in self.phrasal_verb_particles:
-                        phrasal = f"{token.lemma_} {next_token.text}"
-                        
-                        # Get full context
-                        sent = token.sent
-                        context_start = max(0, token.i - 5)
-                        context_end = min(len(doc), token.i + 6)
-                        context = doc[context_start:context_end].text
-                        
-                        expressions.append({
-                            "expression": phrasal,
-                            "type": "phrasal_verb",
-                            "pos": "verb",
-                            "lemma": token.lemma_,
-                            "particle": next_token.text,
-                            "context": context,
-                            "sentence": sent.text,
-                            "language": language,
-                            "category": "phrasal_verbs"
-                        })
+            for _, start, end in self.en_matcher(doc):
+                token = doc[start]
+                next_token = doc[start + 1]
+                phrasal = f"{token.lemma_} {next_token.text}"
+                
+                expressions.append({
+                    "expression": phrasal,
+                    "type": "phrasal_verb",
+                    "pos": "verb",
+                    "lemma": token.lemma_,
+                    "particle": next_token.text,
+                    "context": texts.window(start - 5, start + 6),
+                    "sentence": texts.sentence(token),
+                    "language": language,
+                    "category": "phrasal_verbs"
+                })
             
             # Common collocations using dependency parsing
             for chunk in doc.noun_chunks:
                 if len(chunk) >= 2:
-                    # Clean up chunk text
-                    chunk_text = chunk.text.strip()
-                    chunk_words = chunk_text.split()
-                    
-                    # Skip if too short or starts with common determiners only
-                    if len(chunk_words) < 2 or chunk_text.lower() in ['the', 'a', 'an']:
-                        continue
-                    
                     # Remove leading determiners for cleaner extraction
-                    if chunk_words[0].lower() in ['the', 'a', 'an', 'this', 'that', 'these', 'those']:
-                        chunk_text = ' '.join(chunk_words[1:])
+                    start = 1 if chunk[0].lower in _EN_DETERMINER_HASHES else 0
                     
-                    # Skip if the result is too short or contains only common words
-                    if len(chunk_text.split()) < 2 or len(chunk_text) < 5:
+                    # Skip if the result is too short
+                    if len(chunk) - start < 2:
+                        continue
+                    chunk_text = chunk[start:].text
+                    if len(chunk_text) < 5:
                         continue
                     
                     # Check if it's a meaningful collocation
                     is_meaningful = False
                     for token in chunk:
-                        if token.pos_ in ["NOUN", "PROPN", "ADJ"] and token.lemma_.lower() not in self.skip_words:
+                        if token.pos_ in ["NOUN", "PROPN", "ADJ"] and token.lemma not in self._skip_word_hashes:
                             is_meaningful = True
                             break
                     
@@ -340,89 +804,69 @@ class NLPVocabularyExtractor(VocabularyExtractor):
                             "type": "collocation",
                             "pos": "noun_phrase",
                             "root": chunk.root.text,
-                            "context": chunk.sent.text,
-                            "sentence": chunk.sent.text,
+                            "context": texts.sentence(chunk),
+                            "sentence": texts.sentence(chunk),
                             "language": language,
                             "category": "collocations"
                         })
         
         elif language == 'japanese':
-            # 日本語の複合名詞を抽出
-            i = 0
-            while i < len(doc):
-                token = doc[i]
+            strings = doc.vocab.strings
+            for match_id, start, end in sorted(self.ja_matcher(doc), key=lambda match: match[1]):
+                label = strings[match_id]
+                token = doc[start]
                 
-                # 名詞の連続を検出（複合名詞）
-                if token.pos_ == "NOUN":
-                    compound_parts = [token.text]
-                    j = i + 1
+                # 日本語の複合名詞を抽出
+                if label == "COMPOUND_NOUN":
+                    compound_parts = [t.text for t in doc[start:end]]
+                    compound = "".join(compound_parts)
                     
-                    # 連続する名詞を収集
-                    while j < len(doc) and doc[j].pos_ in ["NOUN", "PROPN"]:
-                        compound_parts.append(doc[j].text)
-                        j += 1
-                    
-                    # 2つ以上の名詞が連続していれば複合名詞として抽出
-                    if len(compound_parts) >= 2:
-                        compound = "".join(compound_parts)
-                        
-                        # 文脈を取得
-                        context_start = max(0, i - 5)
-                        context_end = min(len(doc), j + 5)
-                        context = doc[context_start:context_end].text
-                        
-                        expressions.append({
-                            "expression": compound,
-                            "type": "compound_noun",
-                            "pos": "noun",
-                            "parts": compound_parts,
-                            "context": context,
-                            "sentence": token.sent.text if hasattr(token, 'sent') else context,
-                            "language": language,
-                            "category": "compounds"
-                        })
-                        
-                        i = j - 1  # 複合名詞の最後の位置に移動
+                    expressions.append({
+                        "expression": compound,
+                        "type": "compound_noun",
+                        "pos": "noun",
+                        "parts": compound_parts,
+                        "context": texts.window(start - 5, end + 5),
+                        "sentence": texts.sentence(token),
+                        "language": language,
+                        "category": "compounds"
+                    })
                 
-                # 動詞＋ていく/てくる パターン
-                if token.pos_ == "VERB" and i + 1 < len(doc):
-                    next_token = doc[i + 1]
-                    if next_token.text in ["ていく", "ていきます", "てくる", "てきます", "ている", "ています"]:
-                        verb_phrase = f"{token.text}{next_token.text}"
-                        
-                        expressions.append({
-                            "expression": verb_phrase,
-                            "type": "verb_phrase",
-                            "pos": "verb",
-                            "base_verb": token.lemma_,
-                            "auxiliary": next_token.text,
-                            "context": token.sent.text if hasattr(token, 'sent') else "",
-                            "sentence": token.sent.text if hasattr(token, 'sent') else "",
-                            "language": language,
-                            "category": "verb_patterns"
-                        })
+                elif label == "VERB_PHRASE":
+                    next_token = doc[start + 1]
+                    verb_phrase = f"{token.text}{next_token.text}"
+                    
+                    expressions.append({
+                        "expression": verb_phrase,
+                        "type": "verb_phrase",
+                        "pos": "verb",
+                        "base_verb": token.lemma_,
+                        "auxiliary": next_token.text,
+                        "context": texts.sentence(token),
+                        "sentence": texts.sentence(token),
+                        "language": language,
+                        "category": "verb_patterns"
+                    })
                 
-                # 形容詞＋名詞 パターン
-                if token.pos_ == "ADJ" and i + 1 < len(doc) and doc[i + 1].pos_ == "NOUN":
-                    adj_noun = f"{token.text}{doc[i + 1].text}"
+                elif label == "ADJ_NOUN":
+                    noun = doc[start + 1]
+                    adj_noun = f"{token.text}{noun.text}"
                     
                     expressions.append({
                         "expression": adj_noun,
                         "type": "adj_noun_phrase",
                         "pos": "phrase",
                         "adjective": token.text,
-                        "noun": doc[i + 1].text,
-                        "context": token.sent.text if hasattr(token, 'sent') else "",
-                        "sentence": token.sent.text if hasattr(token, 'sent') else "",
+                        "noun": noun.text,
+                        "context": texts.sentence(token),
+                        "sentence": texts.sentence(token),
                         "language": language,
                         "category": "descriptive_phrases"
                     })
-                
-                i += 1
         
         return expressions
     
-    def _extract_entities(self, doc: Doc, language: str) -> List[Dict]:
+    def _extract_entities(self, doc: Doc, language: str, texts: _SpanTexts) -> List[Dict]:
         """Extract named entities that might be educational"""
         expressions = []
         
@@ -435,61 +879,67 @@ class NLPVocabularyExtractor(VocabularyExtractor):
                     "expression": ent.text,
                     "type": "named_entity",
                     "entity_type": ent.label_,
-                    "context": ent.sent.text,
-                    "sentence": ent.sent.text,
+                    "context": texts.sentence(ent),
+                    "sentence": texts.sentence(ent),
                     "language": language,
                     "category": "entities"
                 })
         
         return expressions
     
-    def _extract_important_words(self, doc: Doc, language: str) -> List[Dict]:
-        """Extract educationally important single words"""
+    def _extract_important_words(
+        self, doc: Doc, language: str, texts: _SpanTexts, seen_lemmas: Set[str]
+    ) -> List[Dict]:
+        """Extract educationally important single words whose lemma isn't in seen_lemmas yet"""
         expressions = []
-        seen_lemmas = set()
+        if not len(doc):
+            return expressions
+        
+        # Skip punctuation, stop words and very short tokens, and keep only
+        # content words, using one bulk attribute read instead of per-token access
+        attrs = doc.to_array(_WORD_FILTER_ATTRS)
+        candidates = (
+            (attrs[:, 0] == 0) & (attrs[:, 1] == 0) & (attrs[:, 2] == 0) &
+            (attrs[:, 3] >= 3) & np.isin(attrs[:, 4], _CONTENT_POS_IDS)
+        )
+        
+        # Skip A1 level common words
+        skip_word_hashes = self._skip_word_hashes
+        tokens = [doc[int(i)] for i in np.flatnonzero(candidates)]
+        tokens = [token for token in tokens if token.lemma not in skip_word_hashes]
         
-        for token in doc:
-            # Skip punctuation, stop words, and very common words
-            if (token.is_punct or token.is_stop or token.is_space or 
-                len(token.text) < 3 or token.lemma_ in seen_lemmas):
+        # Look up CEFR levels for all candidates at once
+        cefr_infos = self.cefr_loader.get_cefr_levels(
+            [token.text for token in tokens], [token.pos_ for token in tokens]
+        )
+        
+        for token, cefr_info in zip(tokens, cefr_infos):
+            if token.lemma_ in seen_lemmas:
                 continue
             
-            # Skip A1 level common words
-            if token.lemma_.lower() in self.skip_words:
+            level_code = cefr_info["level_code"]
+            
+            # Skip A1/A2 level words unless they're part of special vocabulary
+            if 0 < level_code <= _A2_CODE and cefr_info["source"] != "cefr_j":
                 continue
             
-            # Focus on content words
-            if token.pos_ in {"NOUN", "VERB", "ADJ", "ADV"}:
-                # Check if it's an important word
-                cefr_info = self.cefr_loader.get_cefr_level(token.text, token.pos_)
+            # Include B1+ words or words not in common datasets (potentially specialized)
+            if level_code >= _B1_CODE or cefr_info["source"] == "default":
                 
-                # Skip A1/A2 level words unless they're part of special vocabulary
-                if cefr_info["level"] in ["A1", "A2"] and cefr_info["source"] != "cefr_j":
-                    continue
+                seen_lemmas.add(token.lemma_)
                 
-                # Include B1+ words or words not in common datasets (potentially specialized)
-                if (cefr_info["level"] in ["B1", "B2", "C1", "C2"] or 
-                    cefr_info["source"] == "default"):
-                    
-                    seen_lemmas.add(token.lemma_)
-                    
-                    # Get context
-                    context_start = max(0, token.i - 5)
-                    context_end = min(len(doc), token.i + 6)
-                    context = doc[context_start:context_end].text
-                    
-                    expressions.append({
-                        "expression": token.text,
-                        "type": "single_word",
-                        "pos": token.pos_,
-                        "lemma": token.lemma_,
-                        "context": context,
-                        "sentence": token.sent.text,
-                        "language": language,
-                        "category": "vocabulary",
-                        "cefr_level": cefr_info["level"],
-                        "cefr_source": cefr_info["source"]
-                    })
+                expressions.append({
+                    "expression": token.text,
+                    "type": "single_word",
+                    "pos": token.pos_,
+                    "lemma": token.lemma_,
+                    "context": texts.window(token.i - 5, token.i + 6),
+                    "sentence": texts.sentence(token),
+                    "language": language,
+                    "category": "vocabulary",
+                    "cefr_level": cefr_info["level"],
+                    "cefr_source": cefr_info["source"]
+                })
         
         return expressions
     
@@ -498,120 +948,64 @@ class NLPVocabularyExtractor(VocabularyExtractor):
         expressions = []
         
         if language == 'english':
-            # Common idiom patterns + VTuber/Gaming expressions
-            idiom_patterns = [
-                # Traditional idioms
-                (r"\b(piece of cake)\b", "very easy"),
-                (r"\b(break a leg)\b", "good luck"),
-                (r"\b(hit the books)\b", "study hard"),
-                (r"\b(call it a day)\b", "stop working"),
-                (r"\b(under the weather)\b", "feeling sick"),
+            text_lower = _ascii_lower(doc.text)
+            sentence_index = None
+            for pattern, meaning in _candidate_idioms(
+                _EN_IDIOM_PREFILTER, _EN_IDIOM_PATTERNS, _EN_IDIOM_ANCHORS, text_lower
+            ):
+                match = pattern.search(text_lower)
+                if not match:
+                    continue
                 
-                # Gaming/Streaming expressions
-                (r"\b(rage quit)\b", "quit angrily from frustration"),
-                (r"\b(clutch play)\b", "crucial successful play"),
-                (r"\b(throw the game)\b", "intentionally lose"),
-                (r"\b(stream sniper)\b", "viewer who disrupts streams"),
-                (r"\b(backseat gaming)\b", "unwanted advice while playing"),
-                (r"\b(skill issue)\b", "problem due to lack of skill"),
-                (r"\b(touch grass)\b", "go outside/take a break"),
-                (r"\b(no cap)\b", "no lie/for real"),
-                (r"\b(based)\b", "admirable/true to oneself"),
-                (r"\b(cringe)\b", "embarrassing/awkward"),
-                (r"\b(poggers|pog)\b", "awesome/exciting"),
-                (r"\b(copium)\b", "coping/denial"),
-                (r"\b(hopium)\b", "false hope"),
-                (r"\b(throwing hands)\b", "fighting"),
-                (r"\b(down bad)\b", "desperate/struggling"),
-                (r"\b(rent free)\b", "obsessing over something"),
+                # Find the sentence containing this idiom
+                if sentence_index is None:
+                    sentence_index = _SentenceIndex(doc)
+                sent = sentence_index.sentence_at(match.start(1))
                 
-                # Business/work expressions from the video
-                (r"\b(quit (?:my|the) job)\b", "resign from employment"),
-                (r"\b(open(?:ed)? a franchise)\b", "start a franchise business"),
-                (r"\b(MVP today)\b", "most valuable player/person today"),
-                (r"\b(crash(?:ing)? out)\b", "losing control emotionally"),
-                (r"\b(fast food)\b", "quick service restaurant food"),
-                (r"\b(take(?:ing)? (?:the|their) order)\b", "receive customer request"),
-                (r"\b(mess(?:ed)? up)\b", "make a mistake"),
-                (r"\b(stall(?:ing)?)\b", "delay intentionally"),
-            ]
-            
-            text_lower = doc.text.lower()
-            for pattern, meaning in idiom_patterns:
-                if re.search(pattern, text_lower):
-                    match = re.search(pattern, text_lower)
-                    # Find the sentence containing this idiom
-                    for sent in doc.sents:
-                        if match.group(1) in sent.text.lower():
-                            expressions.append({
-                                "expression": match.group(1),
-                                "type": "idiom",
-                                "meaning": meaning,
-                                "context": sent.text,
-                                "sentence": sent.text,
-                                "language": language,
-                                "category": "idioms"
-                            })
-                            break
+                expressions.append({
+                    "expression": match.group(1),
+                    "type": "idiom",
+                    "meaning": meaning,
+                    "context": sent.text,
+                    "sentence": sent.text,
+                    "language": language,
+                    "category": "idioms"
+                })
         
         elif language == 'japanese':
-            # 日本語の慣用表現パターン
-            # VTuberやカジュアルな会話でよく使われる表現
-            idiom_patterns = [
-                # 「さあ」で始まる呼びかけ表現
-                (r"(さあ[^。！、]*(?:ましょう|しよう|いこう|いきます))", "invitation/let's go"),
-                (r"(さあ.*やっていきます)", "let's get started"),
-                
-                # 感嘆・驚き表現
-                (r"(やばい(?:です)?(?:ね)?)", "oh no/amazing"),
-                (r"(まじ(?:で)?(?:か)?)", "seriously/really"),
-                (r"(すご[いく](?:ない)?)", "amazing/incredible"),
-                
-                # 配信でよく使う表現
-                (r"(お疲れ様でした)", "good work/thank you"),
-                (r"(よろしくお願いします)", "please/nice to meet you"),
-                (r"(いらっしゃい(?:ませ)?)", "welcome"),
-                
-                # ゲーム実況でよく使う表現
-                (r"(行く[ぞぜ]ー?)", "let's go"),
-                (r"(やった[ぜぞ]?)", "yes!/did it!"),
-                (r"(ナイス(?:です)?)", "nice!"),
-                
-                # 困った時の表現
-                (r"(どうしよう)", "what should I do"),
-                (r"(困った(?:な)?)", "I'm in trouble"),
-                (r"(やっちゃった)", "oops/I messed up"),
-                
-                # 励まし・応援
-                (r"(頑張[ろれ](?:う)?)", "do your best"),
-                (r"(ファイト(?:だ)?)", "fight/you can do it"),
-                
-                # その他のVTuber特有表現
-                (r"(てぇてぇ)", "precious/wholesome"),
-                (r"(草(?:生える)?)", "lol/funny"),
-                (r"(ぽん(?:です)?)", "silly/clumsy"),
+            text = doc.text
+            matches = [
+                (match.start(1), match.group(1), meaning)
+                for pattern, meaning in _candidate_idioms(_JA_IDIOM_PREFILTER, _JA_IDIOM_PATTERNS, _JA_IDIOM_ANCHORS, text)
+                for match in pattern.finditer(text)
             ]
+            for literal, meaning in _JA_LITERAL_IDIOMS:
+                start_idx = text.find(literal)
+                while start_idx != -1:
+                    matches.append((start_idx, literal, meaning))
+                    start_idx = text.find(literal, start_idx + len(literal))
             
-            text = doc.text
-            for pattern, meaning in idiom_patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    # 文脈を取得
-                    start_idx = text.find(match)
-                    if start_idx != -1:
-                        context_start = max(0, start_idx - 20)
-                        context_end = min(len(text), start_idx + len(match) + 20)
-                        context = text[context_start:context_end]
-                        
-                        expressions.append({
-                            "expression": match,
-                            "type": "idiom",
-                            "meaning": meaning,
-                            "context": context,
-                            "sentence": context,  # 簡易的に文脈を文として使用
-                            "language": language,
-                            "category": "idioms"
-                        })
+            # 文境界があれば、慣用表現を含む文を二分探索で取得
+            sentence_index = None
+            if matches and doc.has_annotation("SENT_START"):
+                sentence_index = _SentenceIndex(doc)
+            
+            for start_idx, expression, meaning in matches:
+                # 文脈を取得
+                context_start = max(0, start_idx - 20)
+                context_end = min(len(text), start_idx + len(expression) + 20)
+                context = text[context_start:context_end]
+                
+                expressions.append({
+                    "expression": expression,
+                    "type": "idiom",
+                    "meaning": meaning,
+                    "context": context,
+                    # 文境界がない場合は簡易的に文脈を文として使用
+                    "sentence": sentence_index.sentence_at(start_idx).text if sentence_index else context,
+                    "language": language,
+                    "category": "idioms"
+                })
         
         return expressions
     
@@ -620,69 +1014,67 @@ class NLPVocabularyExtractor(VocabularyExtractor):
         # Create a map to track unique expressions
         expression_map = {}
         
-        # Process NLP expressions first (higher priority)
-        for expr in nlp_expressions:
-            key = expr["expression"].lower()
-            if key not in expression_map:
-                expression_map[key] = expr
-                expr["extraction_method"] = "nlp"
-        
-        # Add pattern expressions if not already present
-        for expr in pattern_expressions:
-            key = expr["expression"].lower()
-            if key not in expression_map:
+        # Single pass over NLP expressions first (higher priority), then pattern ones
+        for expr, method in chain(
+            ((expr, "nlp") for expr in nlp_expressions),
+            ((expr, "pattern") for expr in pattern_expressions)
+        ):
+            key = expr["expression"]
+            if not key.islower():
+                key = key.lower()
+            
+            existing = expression_map.get(key)
+            if existing is None:
                 expression_map[key] = expr
-                expr["extraction_method"] = "pattern"
-            else:
+                expr["extraction_method"] = method
+            elif method == "pattern":
                 # Merge additional information
-                existing = expression_map[key]
-                if "meaning" in expr and "meaning" not in existing:
-                    existing["meaning"] = expr["meaning"]
-                if "difficulty" in expr and "difficulty" not in existing:
-                    existing["difficulty"] = expr["difficulty"]
+                if "meaning" in expr:
+                    existing.setdefault("meaning", expr["meaning"])
+                if "difficulty" in expr:
+                    existing.setdefault("difficulty", expr["difficulty"])
         
         return list(expression_map.values())
     
     def _enhance_with_cefr(self, expressions: List[Dict], language: str) -> List[Dict]:
-        """Enhance expressions with CEFR levels and educational metadata"""
-        enhanced = []
-        
-        for expr in expressions:
-            # Get CEFR level if not already present
-            if language == 'english' and 'cefr_level' not in expr:
+        """Enhance expressions with CEFR levels and educational metadata (in place)"""
+        # Get CEFR level if not already present, for all expressions at once
+        if language == 'english':
+            lookups = []
+            for expr in expressions:
+                if 'cefr_level' in expr:
+                    continue
                 # For multi-word expressions, check the main word
                 expression = expr.get('expression', '').strip()
                 if expression:
                     main_word = expr.get('lemma', expression.split()[0])
                 else:
                     main_word = expr.get('lemma', '')
-                
                 if main_word:
-                    cefr_info = self.cefr_loader.get_cefr_level(main_word, expr.get('pos'))
-                    expr['cefr_level'] = cefr_info['level']
-                    expr['cefr_confidence'] = cefr_info['confidence']
-                    expr['cefr_source'] = cefr_info['source']
+                    lookups.append((expr, main_word))
             
+            cefr_infos = self.cefr_loader.get_cefr_levels(
+                [main_word for _, main_word in lookups],
+                [expr.get('pos') for expr, _ in lookups]
+            )
+            for (expr, _), cefr_info in zip(lookups, cefr_infos):
+                expr['cefr_level'] = cefr_info['level']
+                expr['cefr_confidence'] = cefr_info['confidence']
+                expr['cefr_source'] = cefr_info['source']
+        
+        for expr in expressions:
             # Set difficulty level for database (1-5 scale)
             if 'difficulty' not in expr:
                 if language == 'english':
-                    cefr_to_difficulty = {
-                        'A1': 1, 'A2': 2, 'B1': 3, 'B2': 4, 'C1': 5, 'C2': 5
-                    }
-                    expr['difficulty'] = cefr_to_difficulty.get(expr.get('cefr_level', 'B1'), 3)
+                    expr['difficulty'] = _CEFR_TO_DIFFICULTY.get(expr.get('cefr_level', 'B1'), 3)
                 else:
                     # Japanese JLPT mapping
-                    jlpt_to_difficulty = {
-                        'N5': 1, 'N4': 2, 'N3': 3, 'N2': 4, 'N1': 5
-                    }
-                    expr['difficulty'] = jlpt_to_difficulty.get(expr.get('difficulty', 'N3'), 3)
+                    expr['difficulty'] = _JLPT_TO_DIFFICULTY.get(expr.get('difficulty', 'N3'), 3)
             
             # Set educational priority
             expr['priority'] = self._calculate_priority(expr, language)
-            
-            enhanced.append(expr)
         
-        return enhanced
+        return expressions
     
     def _calculate_priority(self, expression: Dict, language: str) -> int:
         """Calculate educational priority score (1-10)"""
@@ -690,66 +1082,57 @@ class NLPVocabularyExtractor(VocabularyExtractor):
         
         # Type-based priority adjustments
         expr_type = expression.get('type', '')
-        if expr_type == 'idiom':
-            priority += 3  # Idioms are high value for language learning
-        elif expr_type == 'phrasal_verb':
-            priority += 2  # Phrasal verbs are essential for fluency
-        elif expr_type == 'collocation':
-            priority += 2  # Natural word combinations
-        elif expr_type == 'named_entity' and expression.get('entity_type') in ['ORG', 'PRODUCT']:
+        priority += _TYPE_PRIORITY_BONUS.get(expr_type, 0)
+        if expr_type == 'named_entity' and expression.get('entity_type') in ('ORG', 'PRODUCT'):
             priority += 1  # Brand names and products in context
         
         # CEFR-based adjustments
-        cefr_level = expression.get('cefr_level', 'B1')
-        cefr_source = expression.get('cefr_source', 'default')
-        
         if language == 'english':
             # For English, prioritize B1-B2 level (intermediate)
-            if cefr_level == 'B1':
-                priority += 2
-            elif cefr_level == 'B2':
-                priority += 3
-            elif cefr_level == 'C1':
-                priority += 1
-            elif cefr_level in ['A1', 'A2']:
-                priority -= 2  # Too basic
+            priority += _CEFR_PRIORITY_BONUS_EN.get(expression.get('cefr_level', 'B1'), 0)
             
             # Boost for words NOT in common datasets (specialized vocabulary)
-            if cefr_source == 'default':
+            if expression.get('cefr_source', 'default') == 'default':
                 priority += 1
         
         # Context-based adjustments
         expression_text = expression.get('expression', '').lower()
         
         # Gaming/VTuber context boost
-        gaming_keywords = ['game', 'stream', 'play', 'boss', 'franchise', 'customer', 'order']
-        if any(keyword in expression_text for keyword in gaming_keywords):
+        if _GAMING_KEYWORDS_RE.search(expression_text):
             priority += 1
         
         # Multi-word expressions get a boost
-        if len(expression_text.split()) > 1:
+        if ' ' in expression_text.strip():
             priority += 1
         
         return min(max(priority, 1), 10)  # Clamp between 1-10
     
     def _sort_by_priority(self, expressions: List[Dict]) -> List[Dict]:
         """Sort expressions by educational priority"""
-        def get_numeric_difficulty(expr):
-            diff = expr.get('difficulty', 3)
-            if isinstance(diff, str):
-                # Convert string difficulty to numeric
-                if diff.startswith('N'):
-                    return {'N5': 1, 'N4': 2, 'N3': 3, 'N2': 4, 'N1': 5}.get(diff, 3)
-                else:
-                    return {'A1': 1, 'A2': 2, 'B1': 3, 'B2': 4, 'C1': 5, 'C2': 6}.get(diff, 3)
-            return diff
-        
-        return sorted(expressions, key=lambda x: (x.get('priority', 5), -get_numeric_difficulty(x)), reverse=True)
+        return sorted(expressions, key=_priority_sort_key, reverse=True)
     
     def _generate_cache_key(self, text: str, language: Optional[str]) -> str:
         """Generate cache key for text and language combination"""
-        content = f"{text}:{language or 'auto'}"
-        return f"nlp_vocab:{hashlib.md5(content.encode()).hexdigest()}"
+        # Not a security boundary; XXH3 is fastest on long transcripts, and
+        # BLAKE2b-128 is the stdlib fallback (faster than md5, same key length)
+        h = xxhash.xxh3_128() if XXHASH_AVAILABLE else hashlib.blake2b(digest_size=16)
+        h.update(text.encode())
+        h.update(b":")
+        h.update((language or 'auto').encode())
+        return f"nlp_vocab:{h.hexdigest()}"
+    
+    @staticmethod
+    def _cache_bucket(key: str) -> Tuple[str, str]:
+        """
+        Map a cache key to a Redis hash bucket and field
+        
+        Entries are grouped into hashes keyed by the first 4 hex digits of the
+        digest, which is far cheaper in Redis memory than one string key each.
+        A bucket expires one TTL after its first write, taking its fields with it.
+        """
+        prefix, digest = key.rsplit(":", 1)
+        return f"{prefix}:{digest[:4]}", digest[4:]
     
     def _get_from_cache(self, key: str) -> Optional[List[Dict]]:
         """Get cached result if available"""
@@ -757,9 +1140,14 @@ class NLPVocabularyExtractor(VocabularyExtractor):
             return None
         
         try:
-            cached = self.cache.get(key)
+            bucket, field = self._cache_bucket(key)
+            cached = self.cache.hget(bucket, field)
             if cached:
-                return json.loads(cached)
+                # Buckets expire as a whole, so each value carries its own deadline
+                expires_at, payload = cached.split(":", 1)
+                if int(expires_at) > time.time():
+                    return _load_cache_payload(payload)
+                self.cache.hdel(bucket, field)
         except Exception as e:
             logger.error(f"Cache retrieval error: {str(e)}")
         
@@ -771,7 +1159,16 @@ class NLPVocabularyExtractor(VocabularyExtractor):
             return
         
         try:
-            self.cache.setex(key, self.cache_ttl, json.dumps(data))
+            bucket, field = self._cache_bucket(key)
+            expires_at = int(time.time()) + self.cache_ttl
+            pipe = self.cache.pipeline()
+            pipe.hset(bucket, field, f"{expires_at}:{_dump_cache_payload(data)}")
+            pipe.ttl(bucket)
+            _, bucket_ttl = pipe.execute()
+            # Only a new bucket gets a TTL: refreshing it on every write would keep
+            # busy buckets, and the unread fields in them, alive forever
+            if bucket_ttl == -1:
+                self.cache.expire(bucket, self.cache_ttl)
         except Exception as e:
             logger.error(f"Cache save error: {str(e)}")
     
@@ -793,7 +1190,7 @@ class NLPVocabularyExtractor(VocabularyExtractor):
         
         # Convert to VocabularyModel format
         vocabulary_items = []
-        for expr in nlp_expressions[:50]:  # Limit to top 50
+        for expr in islice(nlp_expressions, 50):  # Limit to top 50
             # Prepare fields based on expression data
             if expr.get('language') == 'english':
                 english_text = expr['expression']
@@ -808,9 +1205,11 @@ class NLPVocabularyExtractor(VocabularyExtractor):
                 reading=expr.get('reading', ''),
                 difficulty_level=expr.get('difficulty', 3),
                 context=expr.get('sentence', expr.get('context', '')),
-                tags=[expr.get('category', 'general'), expr.get('type', 'vocabulary')],
+                # Tag/language values come from a small closed set; intern them so
+                # items built from cached (deserialized) results share one copy
+                tags=[sys.intern(expr.get('category', 'general')), sys.intern(expr.get('type', 'vocabulary'))],
                 source='conversation',
-                source_language=expr.get('language', 'mixed'),
+                source_language=sys.intern(expr.get('language', 'mixed')),
                 notes=self._generate_learning_notes(expr),
                 created_at=datetime.utcnow()
             )
@@ -829,28 +1228,50 @@ class NLPVocabularyExtractor(VocabularyExtractor):
     
     def _generate_learning_notes(self, expression: Dict) -> str:
         """Generate helpful learning notes for the expression"""
-        notes = []
-        
-        # Add type information
         expr_type = expression.get('type', '')
-        if expr_type == 'phrasal_verb':
-            notes.append(f"Phrasal verb: {expression.get('lemma', '')} + {expression.get('particle', '')}")
-        elif expr_type == 'collocation':
-            notes.append(f"Common collocation with '{expression.get('root', '')}'")
-        elif expr_type == 'idiom':
-            notes.append("Idiomatic expression - meaning may not be literal")
-        
-        # Add CEFR information
-        if expression.get('cefr_level'):
-            notes.append(f"CEFR Level: {expression['cefr_level']}")
-            if expression.get('cefr_source') == 'oxford_3000':
-                notes.append("Oxford 3000 - Essential word to know!")
-        
-        # Add usage context
-        if expression.get('extraction_method') == 'nlp':
-            notes.append("Extracted using advanced NLP analysis")
-        
-        return " | ".join(notes) if notes else ""
+        return _learning_notes(
+            expr_type,
+            expression.get('lemma', '') if expr_type == 'phrasal_verb' else '',
+            expression.get('particle', '') if expr_type == 'phrasal_verb' else '',
+            expression.get('root', '') if expr_type == 'collocation' else '',
+            expression.get('cefr_level') or '',
+            expression.get('cefr_source') or '',
+            expression.get('extraction_method') or ''
+        )
+
+
+@lru_cache(maxsize=4096)
+def _learning_notes(
+    expr_type: str,
+    lemma: str,
+    particle: str,
+    root: str,
+    cefr_level: str,
+    cefr_source: str,
+    extraction_method: str
+) -> str:
+    """Build learning notes from the fields they depend on (memoized)"""
+    notes = []
+    
+    # Add type information
+    if expr_type == 'phrasal_verb':
+        notes.append(f"Phrasal verb: {lemma} + {particle}")
+    elif expr_type == 'collocation':
+        notes.append(f"Common collocation with '{root}'")
+    elif expr_type == 'idiom':
+        notes.append("Idiomatic expression - meaning may not be literal")
+    
+    # Add CEFR information
+    if cefr_level:
+        notes.append(f"CEFR Level: {cefr_level}")
+        if cefr_source == 'oxford_3000':
+            notes.append("Oxford 3000 - Essential word to know!")
+    
+    # Add usage context
+    if extraction_method == 'nlp':
+        notes.append("Extracted using advanced NLP analysis")
+    
+    return " | ".join(notes) if notes else ""
 
 
 # Create singleton instance
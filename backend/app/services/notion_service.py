@@ -2,101 +2,142 @@
 Notion API integration for vocabulary database
 """
 
+import asyncio
 import os
 from typing import Dict, List, Optional
 import logging
 from datetime import datetime
 
+import httpx
 from notion_client import Client
 from app.core.config import settings
 from app.models.vocabulary import VocabularyModel
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# One Notion client (and connection pool) shared by every NotionService
+_notion_client: Optional[Client] = None
+
+
+def _get_notion_client() -> Client:
+    """Return the shared Notion client, creating it on first use"""
+    global _notion_client
+    if _notion_client is None:
+        _notion_client = Client(
+            auth=settings.NOTION_TOKEN,
+            client=httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8)
+            )
+        )
+    return _notion_client
+
+# Shared read-only default for properties missing from a page
+_EMPTY_PROPERTY: Dict = {}
+
+
+# Build values in Notion property format
+def _title(content: str) -> Dict:
+    return {"title": [{"text": {"content": content}}]}
+
+
+def _rich_text(content: str) -> Dict:
+    # Notion has a 2000 char limit
+    return {"rich_text": [{"text": {"content": content[:2000]}}]}
+
+
+def _select(name: str) -> Dict:
+    return {"select": {"name": name}}
+
+
+def _multi_select(names: List[str]) -> Dict:
+    return {"multi_select": [{"name": name} for name in names]}
+
+
+def _url(url: Optional[str]) -> Dict:
+    return {"url": url}
+
+
+def _date(start: str) -> Dict:
+    return {"date": {"start": start}}
+
+
+# Extract values from Notion property format
+def _get_text(prop: Dict) -> str:
+    if prop.get("title"):
+        return "".join([t["plain_text"] for t in prop["title"]])
+    elif prop.get("rich_text"):
+        return "".join([t["plain_text"] for t in prop["rich_text"]])
+    return ""
+
+
+def _get_url(prop: Dict) -> str:
+    return prop.get("url", "")
+
+
+def _get_select(prop: Dict) -> str:
+    return prop.get("select", _EMPTY_PROPERTY).get("name", "")
+
+
+def _get_multi_select(prop: Dict) -> List[str]:
+    return [option["name"] for option in prop.get("multi_select", ())]
+
+
+def _get_date(prop: Dict) -> Optional[datetime]:
+    date_val = prop.get("date")
+    if date_val and date_val.get("start"):
+        return datetime.fromisoformat(date_val["start"].replace("Z", "+00:00"))
+    return None
+
 
 class NotionService:
     """Manages Notion database integration"""
     
     def __init__(self):
-        self.client = Client(auth=settings.NOTION_TOKEN)
+        self.client = _get_notion_client()
         self.database_id = settings.NOTION_DATABASE_ID
         
     async def sync_vocabulary_entry(self, entry: VocabularyModel) -> Optional[str]:
         """Sync vocabulary entry to Notion database"""
         try:
             properties = {
-                "日本語": {
-                    "title": [
-                        {
-                            "text": {
-                                "content": entry.japanese_text
-                            }
-                        }
-                    ]
-                },
-                "English": {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": entry.english_text
-                            }
-                        }
-                    ]
-                },
-                "文脈 (Context)": {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": entry.context[:2000] if entry.context else ""  # Notion has a 2000 char limit
-                            }
-                        }
-                    ]
-                },
-                "難易度": {
-                    "select": {
-                        "name": f"レベル{entry.difficulty_level}"
-                    }
-                },
-                "動画元": {
-                    "url": f"https://youtube.com/watch?v={entry.source_video_id}&t={int(entry.video_timestamp)}s" if entry.source_video_id and entry.video_timestamp else None
-                },
-                "作成日": {
-                    "date": {
-                        "start": entry.created_at.isoformat() if entry.created_at else datetime.utcnow().isoformat()
-                    }
-                }
+                "日本語": _title(entry.japanese_text),
+                "English": _rich_text(entry.english_text),
+                "文脈 (Context)": _rich_text(entry.context or ""),
+                "難易度": _select(f"レベル{entry.difficulty_level}"),
+                "動画元": _url(
+                    f"https://youtube.com/watch?v={entry.source_video_id}&t={int(entry.video_timestamp)}s"
+                    if entry.source_video_id and entry.video_timestamp else None
+                ),
+                "作成日": _date((entry.created_at or datetime.utcnow()).isoformat())
             }
             
             # Add tags if present
             if entry.tags:
-                properties["タグ"] = {
-                    "multi_select": [
-                        {"name": tag} for tag in entry.tags[:5]  # Limit to 5 tags
-                    ]
-                }
+                properties["タグ"] = _multi_select(entry.tags[:5])  # Limit to 5 tags
                 
             # Add notes/example sentence if present
             if entry.notes:
-                properties["例文"] = {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": entry.notes[:2000]  # Limit to 2000 chars
-                            }
-                        }
-                    ]
-                }
+                properties["例文"] = _rich_text(entry.notes)
                 
-            # Create or update page
+            # Create or update page (the client is blocking; keep it off the event loop)
             if entry.notion_id:
                 # Update existing page
-                response = self.client.pages.update(
+                response = await asyncio.to_thread(
+                    self.client.pages.update,
                     page_id=entry.notion_id,
                     properties=properties
                 )
             else:
                 # Create new page
-                response = self.client.pages.create(
+                response = await asyncio.to_thread(
+                    self.client.pages.create,
                     parent={"database_id": self.database_id},
                     properties=properties
                 )
@@ -107,6 +148,20 @@ class NotionService:
             logger.error(f"Failed to sync to Notion: {str(e)}")
             return None
             
+    async def sync_many(
+        self,
+        entries: List[VocabularyModel],
+        concurrency: int = 8
+    ) -> List[Optional[str]]:
+        """Sync several entries concurrently, returning Notion IDs in entry order"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def sync_one(entry: VocabularyModel) -> Optional[str]:
+            async with semaphore:
+                return await self.sync_vocabulary_entry(entry)
+        
+        return await asyncio.gather(*(sync_one(entry) for entry in entries))
+            
     async def get_vocabulary_from_notion(
         self,
         limit: int = 100,
@@ -158,39 +213,16 @@ class NotionService:
         try:
             properties = page["properties"]
             
-            # Extract text from Notion property format
-            def get_text(prop):
-                if prop.get("title"):
-                    return "".join([t["plain_text"] for t in prop["title"]])
-                elif prop.get("rich_text"):
-                    return "".join([t["plain_text"] for t in prop["rich_text"]])
-                return ""
-                
-            def get_url(prop):
-                return prop.get("url", "")
-                
-            def get_select(prop):
-                return prop.get("select", {}).get("name", "")
-                
-            def get_multi_select(prop):
-                return [option["name"] for option in prop.get("multi_select", [])]
-                
-            def get_date(prop):
-                date_val = prop.get("date", {})
-                if date_val and date_val.get("start"):
-                    return datetime.fromisoformat(date_val["start"].replace("Z", "+00:00"))
-                return None
-                
             entry = {
                 "notion_id": page["id"],
-                "japanese_text": get_text(properties.get("日本語", {})),
-                "english_text": get_text(properties.get("English", {})),
-                "context": get_text(properties.get("文脈 (Context)", {})),
-                "difficulty_level": get_select(properties.get("難易度", {})),
-                "video_url": get_url(properties.get("動画元", {})),
-                "tags": get_multi_select(properties.get("タグ", {})),
-                "examples": get_text(properties.get("例文", {})),
-                "created_at": get_date(properties.get("作成日", {}))
+                "japanese_text": _get_text(properties.get("日本語", _EMPTY_PROPERTY)),
+                "english_text": _get_text(properties.get("English", _EMPTY_PROPERTY)),
+                "context": _get_text(properties.get("文脈 (Context)", _EMPTY_PROPERTY)),
+                "difficulty_level": _get_select(properties.get("難易度", _EMPTY_PROPERTY)),
+                "video_url": _get_url(properties.get("動画元", _EMPTY_PROPERTY)),
+                "tags": _get_multi_select(properties.get("タグ", _EMPTY_PROPERTY)),
+                "examples": _get_text(properties.get("例文", _EMPTY_PROPERTY)),
+                "created_at": _get_date(properties.get("作成日", _EMPTY_PROPERTY))
             }
             
             return entry
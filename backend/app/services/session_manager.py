@@ -3,9 +3,11 @@ Session management for user conversations (in-memory version)
 """
 
 import asyncio
-from typing import Dict, Optional, List, Any
+import heapq
+import time
+from collections import deque
+from typing import Dict, Optional, List, Any, Tuple
 import uuid
-from datetime import datetime, timedelta
 import json
 import logging
 
@@ -13,6 +15,9 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Keep last 10 turns (20 lines) of conversation history
+MAX_HISTORY_LINES = 20
+
 
 class SessionManager:
     """Manages user sessions and conversation context using in-memory storage"""
@@ -21,15 +26,22 @@ class SessionManager:
         # In-memory storage for MVP (replace with Redis/database in production)
         self.sessions: Dict[str, Dict] = {}
         self.session_ttl = 3600  # 1 hour
+        # Min-heap of (expires_at, session_id); entries for ended sessions are
+        # left in place and skipped when popped, which create_session does too
+        self._expiry_heap: List[Tuple[float, str]] = []
         
     async def create_session(self) -> str:
         """Create a new session and return session ID"""
         session_id = str(uuid.uuid4())
+        now = time.time()
+        expires_at = now + self.session_ttl
         
+        # Timestamps are epoch seconds
         self.sessions[session_id] = {
-            'created_at': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat(),
-            'conversation_history': '',
+            'created_at': now,
+            'expires_at': expires_at,
+            'updated_at': now,
+            'conversation_history': deque(maxlen=MAX_HISTORY_LINES),
             'language_preference': 'auto',
             'context': {},
             'metadata': {
@@ -37,6 +49,9 @@ class SessionManager:
                 'languages_used': set()
             }
         }
+        # Drain the expired front so ended sessions don't pile up in the heap
+        self._pop_expired(now)
+        heapq.heappush(self._expiry_heap, (expires_at, session_id))
         
         logger.info(f"Created new session: {session_id}")
         return session_id
@@ -47,8 +62,7 @@ class SessionManager:
         
         if session:
             # Check if session is expired
-            created_at = datetime.fromisoformat(session['created_at'])
-            if datetime.utcnow() - created_at > timedelta(seconds=self.session_ttl):
+            if time.time() > session['expires_at']:
                 logger.info(f"Session {session_id} expired")
                 del self.sessions[session_id]
                 return None
@@ -68,22 +82,14 @@ class SessionManager:
             logger.warning(f"Session {session_id} not found")
             return False
         
-        # Update conversation history
-        if session['conversation_history']:
-            session['conversation_history'] += f"\nUser: {user_input}\nAI: {ai_response}"
-        else:
-            session['conversation_history'] = f"User: {user_input}\nAI: {ai_response}"
+        # Update conversation history (the deque drops the oldest lines)
+        history = session['conversation_history']
+        history.append(f"User: {user_input}")
+        history.append(f"AI: {ai_response}")
         
         # Update metadata
         session['metadata']['turn_count'] += 1
-        session['updated_at'] = datetime.utcnow().isoformat()
-        
-        # Keep conversation history reasonable size
-        lines = session['conversation_history'].split('\n')
-        if len(lines) > 20:  # Keep last 10 turns (20 lines)
-            session['conversation_history'] = '\n'.join(lines[-20:])
-        
-        self.sessions[session_id] = session
+        session['updated_at'] = time.time()
         return True
     
     async def get_context(self, session_id: str) -> Dict:
@@ -98,7 +104,7 @@ class SessionManager:
             }
         
         return {
-            'conversation_history': session['conversation_history'],
+            'conversation_history': '\n'.join(session['conversation_history']),
             'turn_count': session['metadata']['turn_count'],
             'language_preference': session['language_preference'],
             'context': session['context']
@@ -121,8 +127,7 @@ class SessionManager:
         else:
             session['context'][preference_type] = value
         
-        session['updated_at'] = datetime.utcnow().isoformat()
-        self.sessions[session_id] = session
+        session['updated_at'] = time.time()
         
         logger.info(f"Updated {preference_type} preference for session {session_id}")
         return True
@@ -134,11 +139,9 @@ class SessionManager:
         if not session:
             return False
         
-        session['conversation_history'] = ''
+        session['conversation_history'].clear()
         session['metadata']['turn_count'] = 0
-        session['updated_at'] = datetime.utcnow().isoformat()
-        
-        self.sessions[session_id] = session
+        session['updated_at'] = time.time()
         
         logger.info(f"Reset context for session {session_id}")
         return True
@@ -153,16 +156,20 @@ class SessionManager:
     
     async def cleanup_expired_sessions(self):
         """Clean up expired sessions (call periodically)"""
-        expired = []
-        now = datetime.utcnow()
-        
-        for session_id, session in self.sessions.items():
-            created_at = datetime.fromisoformat(session['created_at'])
-            if now - created_at > timedelta(seconds=self.session_ttl):
-                expired.append(session_id)
-        
-        for session_id in expired:
-            del self.sessions[session_id]
-            
+        expired = self._pop_expired(time.time())
         if expired:
-            logger.info(f"Cleaned up {len(expired)} expired sessions")
\ No newline at end of file
+            logger.info(f"Cleaned up {expired} expired sessions")
+    
+    def _pop_expired(self, now: float) -> int:
+        """Pop heap entries that expired before now, deleting live sessions among them"""
+        expired = 0
+        heap = self._expiry_heap
+        
+        # Only sessions at the front of the heap can have expired
+        while heap and heap[0][0] < now:
+            expires_at, session_id = heapq.heappop(heap)
+            session = self.sessions.get(session_id)
+            if session is not None and session['expires_at'] == expires_at:
+                del self.sessions[session_id]
+                expired += 1
+        return expired
\ No newline at end of file
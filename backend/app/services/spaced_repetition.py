@@ -4,7 +4,39 @@ Based on SM-2 algorithm
 """
 
 from datetime import datetime, timedelta
-from typing import Tuple
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+
+def _sm2_step(easiness_factor: float, interval_days: int, quality: int) -> Tuple[float, int]:
+    """Pure SM-2 update: (new_easiness_factor, new_interval_days)"""
+    # Calculate new easiness factor
+    new_easiness_factor = easiness_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    
+    # Ensure easiness factor doesn't go below 1.3
+    new_easiness_factor = max(1.3, new_easiness_factor)
+    
+    # Calculate new interval
+    if quality < 3:
+        # If quality is less than 3, reset interval
+        new_interval_days = 1
+    elif interval_days == 0:
+        # First review
+        new_interval_days = 1
+    elif interval_days == 1:
+        # Second review
+        new_interval_days = 6
+    else:
+        # Subsequent reviews
+        new_interval_days = round(interval_days * new_easiness_factor)
+    
+    return new_easiness_factor, new_interval_days
 
 
 def calculate_next_review(
@@ -29,32 +61,53 @@ def calculate_next_review(
     Returns:
         Tuple of (new_easiness_factor, new_interval_days, next_review_date)
     """
+    new_easiness_factor, new_interval_days = _sm2_step(easiness_factor, interval_days, quality)
     
-    # Calculate new easiness factor
-    new_easiness_factor = easiness_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    # Calculate next review date
+    next_review_date = datetime.utcnow() + timedelta(days=new_interval_days)
     
-    # Ensure easiness factor doesn't go below 1.3
-    new_easiness_factor = max(1.3, new_easiness_factor)
+    return new_easiness_factor, new_interval_days, next_review_date
+
+
+def batch_calculate_next_review(
+    easiness_factors: Sequence[float],
+    interval_days: Sequence[int],
+    qualities: Sequence[int]
+) -> Tuple[List[float], List[int], List[datetime]]:
+    """
+    Calculate next reviews for many cards at once (e.g. a deck import)
     
-    # Calculate new interval
-    if quality < 3:
-        # If quality is less than 3, reset interval
-        new_interval_days = 1
+    Args:
+        easiness_factors: Current easiness factor per card
+        interval_days: Current interval in days per card
+        qualities: Quality of response per card (0-5 scale)
+    
+    Returns:
+        Tuple of parallel lists (new_easiness_factors, new_interval_days, next_review_dates)
+    """
+    if NUMPY_AVAILABLE:
+        ef = np.asarray(easiness_factors, dtype=np.float64)
+        interval = np.asarray(interval_days, dtype=np.int64)
+        quality = np.asarray(qualities, dtype=np.int64)
+        
+        # Same formulas as _sm2_step, evaluated over whole arrays
+        miss = 5 - quality
+        new_ef = np.maximum(1.3, ef + (0.1 - miss * (0.08 + miss * 0.02)))
+        new_interval = np.where(
+            (quality < 3) | (interval == 0), 1,
+            np.where(interval == 1, 6, np.rint(interval * new_ef).astype(np.int64))
+        )
+        new_efs = new_ef.tolist()
+        new_intervals = new_interval.tolist()
     else:
-        if interval_days == 0:
-            # First review
-            new_interval_days = 1
-        elif interval_days == 1:
-            # Second review
-            new_interval_days = 6
-        else:
-            # Subsequent reviews
-            new_interval_days = round(interval_days * new_easiness_factor)
+        steps = [_sm2_step(*card) for card in zip(easiness_factors, interval_days, qualities)]
+        new_efs = [step[0] for step in steps]
+        new_intervals = [step[1] for step in steps]
     
-    # Calculate next review date
-    next_review_date = datetime.utcnow() + timedelta(days=new_interval_days)
+    now = datetime.utcnow()
+    next_review_dates = [now + timedelta(days=days) for days in new_intervals]
     
-    return new_easiness_factor, new_interval_days, next_review_date
+    return new_efs, new_intervals, next_review_dates
 
 
 def get_initial_interval(quality: int) -> int:
@@ -77,6 +130,13 @@ def get_initial_interval(quality: int) -> int:
         return 4
 
 
+def _decayed_retention(accuracy: float, days_since_review: int) -> float:
+    """Apply review time decay to an accuracy score"""
+    # Decay factor: loses 10% per week without review
+    time_factor = max(0.3, 1 - (days_since_review * 0.1 / 7))
+    return accuracy * time_factor
+
+
 def calculate_retention_score(
     review_count: int,
     correct_count: int,
@@ -102,8 +162,42 @@ def calculate_retention_score(
     # Apply time decay if last review was provided
     if last_reviewed_at:
         days_since_review = (datetime.utcnow() - last_reviewed_at).days
-        # Decay factor: loses 10% per week without review
-        time_factor = max(0.3, 1 - (days_since_review * 0.1 / 7))
-        return accuracy * time_factor
+        return _decayed_retention(accuracy, days_since_review)
+    
+    return accuracy
+
+
+def batch_retention_score(
+    review_counts: Sequence[int],
+    correct_counts: Sequence[int],
+    last_reviewed_at: Sequence[Optional[datetime]]
+) -> List[float]:
+    """
+    Calculate retention scores for many vocabulary items at once
+    
+    Args:
+        review_counts: Total number of reviews per item
+        correct_counts: Number of correct reviews per item
+        last_reviewed_at: Last review timestamp per item (None if never reviewed)
+    
+    Returns:
+        Retention score (0-1) per item
+    """
+    if not NUMPY_AVAILABLE:
+        return [
+            calculate_retention_score(*item)
+            for item in zip(review_counts, correct_counts, last_reviewed_at)
+        ]
+    
+    now = datetime.utcnow()
+    reviews = np.asarray(review_counts, dtype=np.float64)
+    correct = np.asarray(correct_counts, dtype=np.float64)
+    # Whole days since review, NaN for items never reviewed
+    days = np.array(
+        [np.nan if last is None else (now - last).days for last in last_reviewed_at],
+        dtype=np.float64
+    )
     
-    return accuracy
\ No newline at end of file
+    accuracy = np.where(reviews > 0, correct / np.maximum(reviews, 1), 0.0)
+    time_factor = np.maximum(0.3, 1 - (days * 0.1 / 7))
+    return np.where(np.isnan(days), accuracy, accuracy * time_factor).tolist()
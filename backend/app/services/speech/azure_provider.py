@@ -2,8 +2,11 @@
 Azure Speech Service provider
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import weakref
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple
 import azure.cognitiveservices.speech as speechsdk
 
 from app.core.config import settings
@@ -11,6 +14,29 @@ from .base import BaseSpeechService, SpeechProvider
 
 logger = logging.getLogger(__name__)
 
+# Idle recognizers kept per (language, auto-detect) configuration for reuse,
+# and across all configurations
+_POOL_MAX_PER_KEY = 4
+_POOL_MAX_TOTAL = 8
+
+# Client language values accepted by start_recognition, mapped to Azure locales
+_LANGUAGES = {
+    'auto': 'auto',
+    'ja': 'ja-JP',
+    'ja-jp': 'ja-JP',
+    'en': 'en-US',
+    'en-us': 'en-US',
+}
+
+
+def _normalize_language(language: str) -> str:
+    """Map a client-supplied language to a supported locale, falling back to auto-detect"""
+    normalized = _LANGUAGES.get(str(language).strip().lower())
+    if normalized is None:
+        logger.warning("Unsupported recognition language %r, using auto-detect", language)
+        return 'auto'
+    return normalized
+
 
 class AzureSpeechProvider(BaseSpeechService):
     """Azure Cognitive Services Speech provider"""
@@ -18,7 +44,20 @@ class AzureSpeechProvider(BaseSpeechService):
     def __init__(self):
         super().__init__(SpeechProvider.AZURE)
         self.speech_config = None
+        self._auto_detect_config = None
         self._recognizers: Dict[str, speechsdk.SpeechRecognizer] = {}
+        self._recognizer_keys: Dict[str, Tuple[str, bool]] = {}
+        # Stopped recognizers are reused on the next start with the same
+        # configuration instead of tearing down and rebuilding SDK state
+        self._pool: Dict[Tuple[str, bool], List[speechsdk.SpeechRecognizer]] = {}
+        self._pool_size = 0
+        # Serialize start/stop per client so a reconnect racing an in-flight
+        # start cannot allocate a second recognizer and leak the first. A lock
+        # lives only while some start/stop holds or awaits it
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        # Bound concurrent recognizer startups so a burst of connects cannot
+        # storm the SDK with threads and handshakes
+        self._start_sem = asyncio.Semaphore(settings.AZURE_MAX_CONCURRENT_STARTS or 8)
         
         if settings.AZURE_SPEECH_KEY:
             self.speech_config = speechsdk.SpeechConfig(
@@ -30,6 +69,10 @@ class AzureSpeechProvider(BaseSpeechService):
                 speechsdk.PropertyId.SpeechServiceConnection_LanguageIdMode,
                 "Continuous"
             )
+            # Shared by every auto-detect recognizer; the language set is fixed
+            self._auto_detect_config = speechsdk.languageconfig.AutoDetectSourceLanguageConfig(
+                languages=["ja-JP", "en-US"]
+            )
     
     async def start_recognition(self, client_id: str, language: str = 'auto', **kwargs) -> bool:
         """Start continuous speech recognition"""
@@ -37,78 +80,134 @@ class AzureSpeechProvider(BaseSpeechService):
             logger.error("Azure Speech not configured")
             return False
         
-        try:
-            # Create audio configuration
-            audio_config = speechsdk.audio.AudioConfig(use_default_microphone=True)
-            
-            # Create recognizer with auto language detection if needed
-            if language == 'auto':
-                auto_detect_config = speechsdk.languageconfig.AutoDetectSourceLanguageConfig(
-                    languages=["ja-JP", "en-US"]
-                )
-                recognizer = speechsdk.SpeechRecognizer(
-                    speech_config=self.speech_config,
-                    audio_config=audio_config,
-                    auto_detect_source_language_config=auto_detect_config
-                )
-            else:
-                self.speech_config.speech_recognition_language = language
-                recognizer = speechsdk.SpeechRecognizer(
-                    speech_config=self.speech_config,
-                    audio_config=audio_config
-                )
-            
-            # Set up event handlers
-            def recognized_cb(evt):
-                if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                    result = {
-                        'text': evt.result.text,
-                        'language': getattr(evt.result, 'language', language),
-                        'confidence': 0.95,  # Azure doesn't provide confidence scores
-                        'is_final': True
-                    }
-                    # Store result for retrieval
-                    session = self.get_session(client_id) or {}
-                    session['last_result'] = result
-                    self.set_session(client_id, session)
-            
-            def recognizing_cb(evt):
-                if evt.result.reason == speechsdk.ResultReason.RecognizingSpeech:
-                    result = {
-                        'text': evt.result.text,
-                        'language': getattr(evt.result, 'language', language),
-                        'confidence': 0.0,
-                        'is_final': False
-                    }
-                    session = self.get_session(client_id) or {}
-                    session['interim_result'] = result
-                    self.set_session(client_id, session)
-            
-            recognizer.recognized.connect(recognized_cb)
-            recognizer.recognizing.connect(recognizing_cb)
-            
-            # Start continuous recognition
-            recognizer.start_continuous_recognition()
-            self._recognizers[client_id] = recognizer
+        # The language keys the recognizer pool, so only supported values get through
+        language = _normalize_language(language)
+        
+        async with self._lock_for(client_id):
+            # Replace rather than orphan a recognizer left over from a previous start
+            previous = self._recognizers.pop(client_id, None)
+            if previous is not None:
+                try:
+                    await asyncio.to_thread(previous.stop_continuous_recognition)
+                    self._release(client_id, previous)
+                except Exception as e:
+                    self._recognizer_keys.pop(client_id, None)
+                    logger.warning("Error stopping previous Azure recognizer for %s: %s", client_id, e)
             
-            logger.info(f"Started Azure speech recognition for client {client_id}")
-            return True
+            key = (language, language == 'auto')
+            pool = self._pool.get(key)
+            pooled = None
+            if pool:
+                pooled = pool.pop()
+                self._pool_size -= 1
             
-        except Exception as e:
-            logger.error(f"Failed to start Azure recognition: {str(e)}")
-            return False
-    
-    async def stop_recognition(self, client_id: str) -> None:
-        """Stop continuous speech recognition"""
-        if client_id in self._recognizers:
             try:
-                self._recognizers[client_id].stop_continuous_recognition()
-                del self._recognizers[client_id]
-                logger.info(f"Stopped Azure recognition for client {client_id}")
+                # Recognizer setup and start block on the SDK; keep them off the event loop
+                async with self._start_sem:
+                    recognizer = await asyncio.to_thread(
+                        self._build_and_start, client_id, language, pooled
+                    )
+                self._recognizers[client_id] = recognizer
+                self._recognizer_keys[client_id] = key
+                
+                logger.info("Started Azure speech recognition for client %s", client_id)
+                return True
+                
             except Exception as e:
-                logger.error(f"Error stopping recognition: {str(e)}")
+                logger.error(f"Failed to start Azure recognition: {str(e)}")
+                return False
+    
+    def _lock_for(self, client_id: str) -> asyncio.Lock:
+        """Get the lock guarding a client's recognizer"""
+        lock = self._locks.get(client_id)
+        if lock is None:
+            lock = self._locks[client_id] = asyncio.Lock()
+        return lock
+    
+    def _create_recognizer(self, language: str) -> speechsdk.SpeechRecognizer:
+        """Construct a new recognizer for the given language (blocking)"""
+        # Create audio configuration
+        audio_config = speechsdk.audio.AudioConfig(use_default_microphone=True)
+        
+        # Create recognizer with auto language detection if needed
+        if language == 'auto':
+            return speechsdk.SpeechRecognizer(
+                speech_config=self.speech_config,
+                audio_config=audio_config,
+                auto_detect_source_language_config=self._auto_detect_config
+            )
         
-        self.cleanup_session(client_id)
+        # Pass the language per recognizer rather than mutating the shared
+        # config, since several clients may be starting at once
+        return speechsdk.SpeechRecognizer(
+            speech_config=self.speech_config,
+            audio_config=audio_config,
+            language=language
+        )
+    
+    def _build_and_start(
+        self,
+        client_id: str,
+        language: str,
+        recognizer: Optional[speechsdk.SpeechRecognizer] = None
+    ) -> speechsdk.SpeechRecognizer:
+        """Wire a (pooled or new) recognizer's events for the client and start it (blocking)"""
+        if recognizer is None:
+            recognizer = self._create_recognizer(language)
+        
+        # Set up event handlers
+        recognizer.recognized.connect(partial(self._on_recognized, client_id, language))
+        recognizer.recognizing.connect(partial(self._on_recognizing, client_id, language))
+        
+        # Start continuous recognition
+        recognizer.start_continuous_recognition()
+        return recognizer
+    
+    def _on_recognized(self, client_id: str, language: str, evt) -> None:
+        """Store a final recognition result for the client"""
+        if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+            # Store result for retrieval
+            session = self.ensure_session(client_id)
+            session.final_text = evt.result.text
+            session.final_lang = getattr(evt.result, 'language', language)
+            session.final_conf = 0.95  # Azure doesn't provide confidence scores
+    
+    def _on_recognizing(self, client_id: str, language: str, evt) -> None:
+        """Store an interim recognition result for the client"""
+        if evt.result.reason == speechsdk.ResultReason.RecognizingSpeech:
+            session = self.ensure_session(client_id)
+            session.interim_text = evt.result.text
+            session.interim_lang = getattr(evt.result, 'language', language)
+            session.interim_conf = 0.0
+    
+    def _release(self, client_id: str, recognizer: speechsdk.SpeechRecognizer) -> None:
+        """Detach a stopped recognizer from its client and return it to the pool"""
+        key = self._recognizer_keys.pop(client_id, None)
+        recognizer.recognized.disconnect_all()
+        recognizer.recognizing.disconnect_all()
+        if key is None or self._pool_size >= _POOL_MAX_TOTAL:
+            return
+        pool = self._pool.setdefault(key, [])
+        if len(pool) < _POOL_MAX_PER_KEY:
+            pool.append(recognizer)
+            self._pool_size += 1
+    
+    async def stop_recognition(self, client_id: str) -> None:
+        """Stop continuous speech recognition"""
+        async with self._lock_for(client_id):
+            recognizer = self._recognizers.pop(client_id, None)
+            if recognizer is not None:
+                try:
+                    await asyncio.to_thread(recognizer.stop_continuous_recognition)
+                    self._release(client_id, recognizer)
+                    logger.info("Stopped Azure recognition for client %s", client_id)
+                except Exception as e:
+                    # Don't pool a recognizer in an unknown state
+                    self._recognizer_keys.pop(client_id, None)
+                    logger.error(f"Error stopping recognition: {str(e)}")
+            
+            # The recognizer is already handled above; just drop session state
+            super().cleanup_session(client_id)
     
     async def process_audio(self, client_id: str, audio_data: bytes) -> Optional[Dict[str, Any]]:
         """Process audio data - not used for Azure (uses microphone directly)"""
@@ -116,11 +215,20 @@ class AzureSpeechProvider(BaseSpeechService):
         return None
     
     def cleanup_session(self, client_id: str) -> None:
-        """Clean up resources"""
-        if client_id in self._recognizers:
+        """Clean up resources, stopping a recognizer left running for the client"""
+        recognizer = self._recognizers.pop(client_id, None)
+        if recognizer is not None:
             try:
-                self._recognizers[client_id].stop_continuous_recognition()
-                del self._recognizers[client_id]
+                recognizer.stop_continuous_recognition()
+                self._release(client_id, recognizer)
             except:
-                pass
-        super().cleanup_session(client_id)
\ No newline at end of file
+                self._recognizer_keys.pop(client_id, None)
+        super().cleanup_session(client_id)
+    
+    def shutdown(self) -> None:
+        """Stop every client's recognizer and drop the idle pool"""
+        for client_id in list(self._recognizers):
+            self.cleanup_session(client_id)
+        self._pool.clear()
+        self._pool_size = 0
+        super().shutdown()
@@ -14,12 +14,71 @@ class SpeechProvider(str, Enum):
     LOCAL = "local"
 
 
+class _Session:
+    """Per-client provider state (slotted; providers set only the fields they use)"""
+    
+    __slots__ = (
+        'final_text',
+        'final_lang',
+        'final_conf',
+        'interim_text',
+        'interim_lang',
+        'interim_conf',
+        'last_final_transcript',
+        'transcript_buffer',
+        'language',
+        'started_at',
+        'ended_at',
+        'recognition_active',
+    )
+    
+    def __init__(self):
+        # Latest final/interim recognition, stored as fields so per-partial
+        # callbacks don't allocate a result dict
+        self.final_text: Optional[str] = None
+        self.final_lang: Optional[str] = None
+        self.final_conf: float = 0.0
+        self.interim_text: Optional[str] = None
+        self.interim_lang: Optional[str] = None
+        self.interim_conf: float = 0.0
+        self.last_final_transcript: Optional[str] = None
+        self.transcript_buffer: str = ''
+        self.language: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self.ended_at: Optional[str] = None
+        self.recognition_active: bool = False
+    
+    @property
+    def last_result(self) -> Optional[Dict[str, Any]]:
+        """Latest final result as a recognition result dict"""
+        if self.final_text is None:
+            return None
+        return {
+            'text': self.final_text,
+            'language': self.final_lang,
+            'confidence': self.final_conf,
+            'is_final': True
+        }
+    
+    @property
+    def interim_result(self) -> Optional[Dict[str, Any]]:
+        """Latest interim result as a recognition result dict"""
+        if self.interim_text is None:
+            return None
+        return {
+            'text': self.interim_text,
+            'language': self.interim_lang,
+            'confidence': self.interim_conf,
+            'is_final': False
+        }
+
+
 class BaseSpeechService(ABC):
     """Abstract base class for speech recognition services"""
     
     def __init__(self, provider: SpeechProvider):
         self.provider = provider
-        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._sessions: Dict[str, _Session] = {}
     
     @abstractmethod
     async def start_recognition(self, client_id: str, language: str = 'auto', **kwargs) -> bool:
@@ -51,10 +110,21 @@ class BaseSpeechService(ABC):
         if client_id in self._sessions:
             del self._sessions[client_id]
     
-    def get_session(self, client_id: str) -> Optional[Dict[str, Any]]:
+    def shutdown(self) -> None:
+        """Release provider-wide resources on application shutdown"""
+        self._sessions.clear()
+    
+    def get_session(self, client_id: str) -> Optional[_Session]:
         """Get session data for a client"""
         return self._sessions.get(client_id)
     
-    def set_session(self, client_id: str, data: Dict[str, Any]) -> None:
+    def set_session(self, client_id: str, data: _Session) -> None:
         """Set session data for a client"""
-        self._sessions[client_id] = data
\ No newline at end of file
+        self._sessions[client_id] = data
+    
+    def ensure_session(self, client_id: str) -> _Session:
+        """Get session data for a client, creating an empty session if needed"""
+        session = self._sessions.get(client_id)
+        if session is None:
+            session = self._sessions[client_id] = _Session()
+        return session
\ No newline at end of file
@@ -21,7 +21,8 @@ class SpeechManager:
     
     def __init__(self):
         self.providers: Dict[SpeechProvider, BaseSpeechService] = {}
-        self._client_providers: Dict[str, SpeechProvider] = {}
+        # Resolved provider service per client
+        self._client_services: Dict[str, BaseSpeechService] = {}
         
         # Initialize available providers
         self._init_providers()
@@ -63,28 +64,21 @@ class SpeechManager:
             return False
         
         # Track which provider the client is using
-        self._client_providers[client_id] = provider_type
+        self._client_services[client_id] = service
         
         return await service.start_recognition(client_id, language, **kwargs)
     
     async def stop_recognition(self, client_id: str) -> None:
         """Stop speech recognition for a client"""
-        provider_type = self._client_providers.get(client_id)
-        if provider_type:
-            service = self.get_provider(provider_type)
-            if service:
-                await service.stop_recognition(client_id)
-            del self._client_providers[client_id]
+        service = self._client_services.pop(client_id, None)
+        if service:
+            await service.stop_recognition(client_id)
     
     async def process_audio(self, client_id: str, audio_data: bytes) -> Optional[Dict[str, Any]]:
         """Process audio data"""
-        provider_type = self._client_providers.get(client_id)
-        if not provider_type:
-            logger.error(f"No provider found for client {client_id}")
-            return None
-        
-        service = self.get_provider(provider_type)
+        service = self._client_services.get(client_id)
         if not service:
+            logger.error(f"No provider found for client {client_id}")
             return None
         
         return await service.process_audio(client_id, audio_data)
@@ -95,25 +89,28 @@ class SpeechManager:
         result: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Process recognition result (for client-side recognition)"""
-        provider_type = self._client_providers.get(client_id, SpeechProvider.WEB_SPEECH)
-        service = self.get_provider(provider_type)
+        service = self._client_services.get(client_id) or self.get_provider(SpeechProvider.WEB_SPEECH)
         
         if not service:
             return {
                 'success': False,
-                'error': f'Provider {provider_type} not available'
+                'error': f'Provider {SpeechProvider.WEB_SPEECH} not available'
             }
         
         return await service.process_recognition_result(client_id, result)
     
     def cleanup_client(self, client_id: str) -> None:
         """Clean up all resources for a client"""
-        provider_type = self._client_providers.get(client_id)
-        if provider_type:
-            service = self.get_provider(provider_type)
-            if service:
-                service.cleanup_session(client_id)
-            del self._client_providers[client_id]
+        service = self._client_services.pop(client_id, None)
+        if service:
+            service.cleanup_session(client_id)
+    
+    def shutdown(self) -> None:
+        """Clean up every client and shut the providers down"""
+        for client_id in list(self._client_services):
+            self.cleanup_client(client_id)
+        for service in self.providers.values():
+            service.shutdown()
     
     def get_available_providers(self) -> list[str]:
         """Get list of available providers"""
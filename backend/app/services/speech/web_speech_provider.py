@@ -3,6 +3,8 @@ Web Speech API provider (browser-based)
 """
 
 import logging
+import re
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -10,6 +12,27 @@ from .base import BaseSpeechService, SpeechProvider
 
 logger = logging.getLogger(__name__)
 
+# Japanese characters for _detect_language
+_JAPANESE_CHAR_RE = re.compile(
+    '['
+    '\u3040-\u309f'  # Hiragana
+    '\u30a0-\u30ff'  # Katakana
+    '\u3400-\u4dbf'  # CJK Extension A
+    '\u4e00-\u9faf'  # CJK Unified Ideographs (Kanji)
+    ']'
+)
+
+# User-facing messages for common Web Speech API error codes
+_ERROR_RESPONSES = MappingProxyType({
+    'no-speech': "No speech detected. Please try again.",
+    'audio-capture': "Microphone access denied or unavailable.",
+    'not-allowed': "Speech recognition permission denied.",
+    'network': "Network error occurred. Please check your connection.",
+    'aborted': "Speech recognition was aborted.",
+    'language-not-supported': "The selected language is not supported.",
+    'service-not-allowed': "Speech recognition service is not available."
+})
+
 
 class WebSpeechProvider(BaseSpeechService):
     """Web Speech API provider - processes results from browser"""
@@ -19,23 +42,21 @@ class WebSpeechProvider(BaseSpeechService):
     
     async def start_recognition(self, client_id: str, language: str = 'auto', **kwargs) -> bool:
         """Initialize recognition session (actual recognition happens in browser)"""
-        session_data = {
-            'started_at': datetime.utcnow().isoformat(),
-            'language': language,
-            'transcript_buffer': '',
-            'recognition_active': True
-        }
-        self.set_session(client_id, session_data)
-        logger.info(f"Initialized Web Speech session for client {client_id}")
+        session = self.ensure_session(client_id)
+        session.started_at = datetime.utcnow().isoformat()
+        session.language = language
+        session.transcript_buffer = ''
+        session.recognition_active = True
+        logger.info("Initialized Web Speech session for client %s", client_id)
         return True
     
     async def stop_recognition(self, client_id: str) -> None:
         """Stop recognition session"""
         session = self.get_session(client_id)
         if session:
-            session['recognition_active'] = False
-            session['ended_at'] = datetime.utcnow().isoformat()
-        logger.info(f"Stopped Web Speech session for client {client_id}")
+            session.recognition_active = False
+            session.ended_at = datetime.utcnow().isoformat()
+        logger.info("Stopped Web Speech session for client %s", client_id)
     
     async def process_audio(self, client_id: str, audio_data: bytes) -> Optional[Dict[str, Any]]:
         """Web Speech API doesn't process audio directly - it runs in browser"""
@@ -44,10 +65,8 @@ class WebSpeechProvider(BaseSpeechService):
     
     async def process_recognition_result(self, client_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
         """Process recognition result from browser"""
-        session = self.get_session(client_id)
-        if not session:
-            session = {'transcript_buffer': ''}
-            self.set_session(client_id, session)
+        # start_recognition normally created the session already
+        session = self.ensure_session(client_id)
         
         transcript = result.get('transcript', '')
         is_final = result.get('isFinal', False)
@@ -60,10 +79,10 @@ class WebSpeechProvider(BaseSpeechService):
         
         # Update session transcript
         if is_final:
-            session['transcript_buffer'] = ''
-            session['last_final_transcript'] = transcript
+            session.transcript_buffer = ''
+            session.last_final_transcript = transcript
         else:
-            session['transcript_buffer'] = transcript
+            session.transcript_buffer = transcript
         
         return {
             'success': True,
@@ -80,18 +99,7 @@ class WebSpeechProvider(BaseSpeechService):
         
         logger.error(f"Web Speech error for client {client_id}: {error_type} - {error_message}")
         
-        # Common error handling
-        error_responses = {
-            'no-speech': "No speech detected. Please try again.",
-            'audio-capture': "Microphone access denied or unavailable.",
-            'not-allowed': "Speech recognition permission denied.",
-            'network': "Network error occurred. Please check your connection.",
-            'aborted': "Speech recognition was aborted.",
-            'language-not-supported': "The selected language is not supported.",
-            'service-not-allowed': "Speech recognition service is not available."
-        }
-        
-        user_message = error_responses.get(error_type, f"Speech recognition error: {error_message}")
+        user_message = _ERROR_RESPONSES.get(error_type) or f"Speech recognition error: {error_message}"
         
         return {
             'error_type': error_type,
@@ -105,7 +113,7 @@ class WebSpeechProvider(BaseSpeechService):
             return 'unknown'
         
         # Count character types
-        japanese_chars = sum(1 for c in text if self._is_japanese(c))
+        japanese_chars = _JAPANESE_CHAR_RE.subn('', text)[1]
         total_chars = len(text)
         
         # If more than 20% Japanese characters, consider it Japanese
@@ -113,14 +121,3 @@ class WebSpeechProvider(BaseSpeechService):
             return 'ja-JP'
         else:
             return 'en-US'
-    
-    @staticmethod
-    def _is_japanese(char: str) -> bool:
-        """Check if a character is Japanese (Hiragana, Katakana, or Kanji)"""
-        code = ord(char)
-        return (
-            (0x3040 <= code <= 0x309F) or  # Hiragana
-            (0x30A0 <= code <= 0x30FF) or  # Katakana
-            (0x4E00 <= code <= 0x9FAF) or  # CJK Unified Ideographs (Kanji)
-            (0x3400 <= code <= 0x4DBF)     # CJK Extension A
-        )
\ No newline at end of file
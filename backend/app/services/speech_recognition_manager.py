@@ -2,29 +2,44 @@
 Speech recognition state management
 """
 
+import heapq
 import logging
-from typing import Dict, Optional, Any
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 import asyncio
+import time
 
 logger = logging.getLogger(__name__)
 
+# Keep only last 50 transcripts to prevent memory issues
+MAX_FINAL_TRANSCRIPTS = 50
 
-@dataclass
+# Seconds between inactive session cleanup passes
+CLEANUP_INTERVAL = 300
+
+
+@dataclass(slots=True)
 class SpeechSession:
     """Speech recognition session state"""
     client_id: str
     language: str = 'ja-JP'
     started_at: datetime = field(default_factory=datetime.utcnow)
-    last_activity: datetime = field(default_factory=datetime.utcnow)
+    # time.monotonic() of the last activity; cheap to update on every transcript
+    last_activity_mono: float = field(default_factory=time.monotonic)
     is_active: bool = True
     interim_transcript: str = ""
-    final_transcripts: list = field(default_factory=list)
+    final_transcripts: deque = field(default_factory=lambda: deque(maxlen=MAX_FINAL_TRANSCRIPTS))
     error_count: int = 0
     total_duration: float = 0.0
     recognition_count: int = 0
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None  # Created on first use
+    
+    @property
+    def last_activity(self) -> datetime:
+        """Wall-clock (UTC) time of the last activity"""
+        return datetime.utcnow() - timedelta(seconds=time.monotonic() - self.last_activity_mono)
 
 
 class SpeechRecognitionManager:
@@ -33,20 +48,24 @@ class SpeechRecognitionManager:
     def __init__(self, session_timeout_minutes: int = 30):
         self.sessions: Dict[str, SpeechSession] = {}
         self.session_timeout = timedelta(minutes=session_timeout_minutes)
-        self._cleanup_task = None
+        self._cleanup_handle: Optional[asyncio.TimerHandle] = None
+        # Stats of ended sessions, keyed by client and tagged with the
+        # (last_activity_mono, total_duration) they were computed from
+        self._stats_cache: Dict[str, Tuple[Tuple[float, float], Dict[str, Any]]] = {}
+        # Min-heap of (last_activity_mono, client_id) for ended sessions; entries
+        # whose session was reactivated or touched since are skipped on cleanup
+        self._expiry_heap: List[Tuple[float, str]] = []
         
     async def start(self):
-        """Start the manager with background cleanup task"""
-        self._cleanup_task = asyncio.create_task(self._cleanup_inactive_sessions())
+        """Start the manager with periodic background cleanup"""
+        loop = asyncio.get_running_loop()
+        self._cleanup_handle = loop.call_later(CLEANUP_INTERVAL, self._cleanup_inactive_sessions, loop)
         
     async def stop(self):
         """Stop the manager and cleanup"""
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-            try:
-                await self._cleanup_task
-            except asyncio.CancelledError:
-                pass
+        if self._cleanup_handle:
+            self._cleanup_handle.cancel()
+            self._cleanup_handle = None
     
     async def create_session(self, client_id: str, language: str = 'ja-JP') -> SpeechSession:
         """Create or update a speech recognition session"""
@@ -55,13 +74,13 @@ class SpeechRecognitionManager:
             session = self.sessions[client_id]
             session.is_active = True
             session.language = language
-            session.last_activity = datetime.utcnow()
-            logger.info(f"Reactivated speech session for {client_id}")
+            session.last_activity_mono = time.monotonic()
+            logger.info("Reactivated speech session for %s", client_id)
         else:
             # Create new session
             session = SpeechSession(client_id=client_id, language=language)
             self.sessions[client_id] = session
-            logger.info(f"Created new speech session for {client_id}")
+            logger.info("Created new speech session for %s", client_id)
         
         return session
     
@@ -69,7 +88,7 @@ class SpeechRecognitionManager:
         """Update session activity timestamp"""
         if client_id in self.sessions:
             session = self.sessions[client_id]
-            session.last_activity = datetime.utcnow()
+            session.last_activity_mono = time.monotonic()
             return session
         return None
     
@@ -78,7 +97,8 @@ class SpeechRecognitionManager:
         session = await self.update_session_activity(client_id)
         if session:
             session.interim_transcript = transcript
-            logger.debug(f"Updated interim transcript for {client_id}: {transcript[:50]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Updated interim transcript for %s: %.50s...", client_id, transcript)
         return session
     
     async def add_final_transcript(
@@ -94,7 +114,7 @@ class SpeechRecognitionManager:
             # Clear interim transcript
             session.interim_transcript = ""
             
-            # Add to history
+            # Add to history (the deque drops the oldest entries)
             session.final_transcripts.append({
                 'transcript': transcript,
                 'confidence': confidence,
@@ -105,11 +125,7 @@ class SpeechRecognitionManager:
             # Update stats
             session.recognition_count += 1
             
-            # Keep only last 50 transcripts to prevent memory issues
-            if len(session.final_transcripts) > 50:
-                session.final_transcripts = session.final_transcripts[-50:]
-            
-            logger.info(f"Added final transcript for {client_id}: {transcript}")
+            logger.info("Added final transcript for %s: %s", client_id, transcript)
         return session
     
     async def record_error(self, client_id: str, error_type: str, error_message: str) -> Optional[SpeechSession]:
@@ -119,6 +135,8 @@ class SpeechRecognitionManager:
             session.error_count += 1
             
             # Store last error in metadata
+            if session.metadata is None:
+                session.metadata = {}
             session.metadata['last_error'] = {
                 'type': error_type,
                 'message': error_message,
@@ -134,12 +152,11 @@ class SpeechRecognitionManager:
             session = self.sessions[client_id]
             session.is_active = False
             session.total_duration = (datetime.utcnow() - session.started_at).total_seconds()
+            heapq.heappush(self._expiry_heap, (session.last_activity_mono, client_id))
             
             logger.info(
-                f"Ended speech session for {client_id}. "
-                f"Duration: {session.total_duration:.1f}s, "
-                f"Recognitions: {session.recognition_count}, "
-                f"Errors: {session.error_count}"
+                "Ended speech session for %s. Duration: %.1fs, Recognitions: %d, Errors: %d",
+                client_id, session.total_duration, session.recognition_count, session.error_count
             )
             
             return session
@@ -155,11 +172,19 @@ class SpeechRecognitionManager:
         if not session:
             return {}
         
+        # Ended sessions only change when a mutator touches last_activity or
+        # end_session recomputes total_duration
+        version = (session.last_activity_mono, session.total_duration)
+        if not session.is_active:
+            cached = self._stats_cache.get(client_id)
+            if cached and cached[0] == version:
+                return cached[1]
+        
         current_duration = session.total_duration
         if session.is_active:
             current_duration = (datetime.utcnow() - session.started_at).total_seconds()
         
-        return {
+        stats = {
             'client_id': client_id,
             'language': session.language,
             'is_active': session.is_active,
@@ -170,6 +195,9 @@ class SpeechRecognitionManager:
             'last_activity': session.last_activity.isoformat(),
             'transcript_history_length': len(session.final_transcripts)
         }
+        if not session.is_active:
+            self._stats_cache[client_id] = (version, stats)
+        return stats
     
     async def get_all_active_sessions(self) -> Dict[str, SpeechSession]:
         """Get all active sessions"""
@@ -179,30 +207,42 @@ class SpeechRecognitionManager:
             if session.is_active
         }
     
-    async def _cleanup_inactive_sessions(self):
-        """Background task to cleanup inactive sessions"""
-        while True:
-            try:
-                await asyncio.sleep(300)  # Check every 5 minutes
-                
-                current_time = datetime.utcnow()
-                sessions_to_remove = []
-                
-                for client_id, session in self.sessions.items():
-                    if not session.is_active and (current_time - session.last_activity) > self.session_timeout:
-                        sessions_to_remove.append(client_id)
-                
-                for client_id in sessions_to_remove:
-                    del self.sessions[client_id]
-                    logger.info(f"Cleaned up inactive speech session: {client_id}")
-                
-                if sessions_to_remove:
-                    logger.info(f"Cleaned up {len(sessions_to_remove)} inactive speech sessions")
-                    
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in speech session cleanup: {str(e)}")
+    def _cleanup_inactive_sessions(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Timer callback that cleans up inactive sessions and re-arms itself"""
+        try:
+            removed = self._expire_inactive_sessions(time.monotonic())
+            if removed:
+                logger.info(f"Cleaned up {removed} inactive speech sessions")
+        except Exception as e:
+            logger.error(f"Error in speech session cleanup: {str(e)}")
+        finally:
+            self._cleanup_handle = loop.call_later(CLEANUP_INTERVAL, self._cleanup_inactive_sessions, loop)
+
+    
+    def _expire_inactive_sessions(self, now: float) -> int:
+        """Remove ended sessions idle longer than the timeout; returns the count"""
+        heap = self._expiry_heap
+        cutoff = now - self.session_timeout.total_seconds()
+        removed = 0
+        
+        # Only entries at the front of the heap can be past the timeout
+        while heap and heap[0][0] < cutoff:
+            last_activity, client_id = heapq.heappop(heap)
+            session = self.sessions.get(client_id)
+            if session is None or session.is_active:
+                # Gone already, or reactivated (end_session will push it again)
+                continue
+            if session.last_activity_mono != last_activity:
+                # Touched after it ended; track the newer timestamp instead
+                heapq.heappush(heap, (session.last_activity_mono, client_id))
+                continue
+            
+            del self.sessions[client_id]
+            self._stats_cache.pop(client_id, None)
+            logger.info(f"Cleaned up inactive speech session: {client_id}")
+            removed += 1
+        
+        return removed
 
 
 # Global instance
@@ -4,13 +4,22 @@ Core business logic for converting conversations and videos into educational con
 """
 
 import re
+import json
 import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 import hashlib
 
 # Optional imports
+try:
+    import re2  # google-re2: linear-time matching for the expression patterns
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+    re2 = None
+
 try:
     from app.services.youtube_service import YouTubeService
 except ImportError:
@@ -26,6 +35,127 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_JSON_DECODER = json.JSONDecoder()
+# Opening of a JSON array of objects in a (possibly partial) AI response
+_JSON_ARRAY_START_RE = re.compile(r'\[\s*\{')
+# "1. [japanese] - [english] - [reading]" lines of an enhancement response
+_ENHANCEMENT_LINE_RE = re.compile(r'^(\d+)\.\s*(.+?)\s*-\s*(.+?)\s*-\s*(.+?)$', re.MULTILINE)
+
+# Character classes for detect_language
+_JAPANESE_CHARS_RE = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
+_LATIN_CHARS_RE = re.compile(r'[a-zA-Z]')
+_WHITESPACE_RE = re.compile(r'\s')
+
+# AI responses kept for repeated conversation transcripts (LRU)
+_RESPONSE_CACHE_SIZE = 1024
+
+# Attempts per video in process_batch_videos when the APIs report rate limiting
+_VIDEO_ATTEMPTS = 3
+
+# Sentence boundaries used to find the sentence a pattern matched in
+_SENTENCE_SPLIT_RE = {
+    'japanese': re.compile(r'[。！？\n]'),
+    'english': re.compile(r'[.!?\n]'),
+}
+
+
+def _find_json_array(text: str, element_type: type) -> Optional[list]:
+    """
+    Find the first JSON array in free-form AI output whose first element is of element_type
+    
+    Each '[' is handed to the C decoder's raw_decode, which stops at the end of
+    the array, so surrounding prose, code fences or trailing text are ignored.
+    """
+    start = text.find('[')
+    while start != -1:
+        try:
+            value, _ = _JSON_DECODER.raw_decode(text, start)
+        except ValueError:
+            pass
+        else:
+            if isinstance(value, list) and value and isinstance(value[0], element_type):
+                return value
+        start = text.find('[', start + 1)
+    return None
+
+
+class _JsonItemStream:
+    """Pull complete objects out of a JSON array of objects as its text streams in"""
+    
+    def __init__(self):
+        self.text = ""
+        self._pos: Optional[int] = None  # Scan position once the array has started
+        self._done = False
+    
+    def feed(self, chunk: str) -> List[Dict]:
+        """Add a chunk of response text and return the objects it completed"""
+        self.text += chunk
+        if self._done:
+            return []
+        
+        if self._pos is None:
+            match = _JSON_ARRAY_START_RE.search(self.text)
+            if not match:
+                return []
+            self._pos = match.end() - 1
+        
+        items = []
+        text = self.text
+        while True:
+            start = text.find('{', self._pos)
+            if start == -1:
+                break
+            if text[self._pos:start].strip(' \t\r\n,'):
+                # Anything but separators before the next object means the array ended
+                self._done = True
+                break
+            try:
+                value, end = _JSON_DECODER.raw_decode(text, start)
+            except ValueError:
+                break  # Object not complete yet
+            items.append(value)
+            self._pos = end
+        return items
+
+
+def _is_rate_limited(error: str) -> bool:
+    """Whether an extraction error message looks like an API rate limit / quota error"""
+    error = error.lower()
+    return '429' in error or 'rate limit' in error or 'quota' in error or 'exhausted' in error
+
+
+def _compile_expression(pattern: str, ignore_case: bool = False):
+    """Compile an expression pattern with RE2 when available, else with re"""
+    if RE2_AVAILABLE:
+        # Note RE2's \b is ASCII-only, so English words directly next to kana
+        # or kanji also match there
+        return re2.compile(f'(?i){pattern}' if ignore_case else pattern)
+    return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+
+
+def _compile_patterns(patterns: Dict[str, List[tuple]], ignore_case: bool = False) -> List[tuple]:
+    """Compile a category -> pattern list table into (regex, category, meaning, difficulty, priority) rows"""
+    compiled = []
+    for category, entries in patterns.items():
+        for pattern_data in entries:
+            # Handle new pattern format with priority
+            if len(pattern_data) == 4:
+                pattern, meaning, difficulty, priority = pattern_data
+            else:
+                pattern, meaning = pattern_data
+                difficulty = 3  # Numeric value for N3/B1 level
+                priority = 5
+            compiled.append((_compile_expression(pattern, ignore_case), category, meaning, difficulty, priority))
+    return compiled
+
+
+def _compile_gate(patterns: Dict[str, List[tuple]], ignore_case: bool = False):
+    """Fuse a pattern table into one alternation that matches wherever any of its patterns would"""
+    return _compile_expression(
+        '|'.join(f'(?:{entry[0]})' for entries in patterns.values() for entry in entries),
+        ignore_case
+    )
+
 
 class VocabularyExtractor:
     """
@@ -37,6 +167,9 @@ class VocabularyExtractor:
         self.youtube_service = YouTubeService() if YouTubeService else None
         self.notion_service = NotionService() if NotionService else None
         self.ai_responder = None  # Lazy initialization to avoid circular import
+        # Raw AI responses keyed by a hash of the analysis prompt; repeated
+        # transcripts are re-parsed from here instead of calling the model again
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
         
         # Expression patterns for extraction - Bilingual support
         self.japanese_patterns = {
@@ -150,6 +283,17 @@ class VocabularyExtractor:
         
         # Initialize with default patterns based on expected primary usage
         self.expression_patterns = self.japanese_patterns
+        
+        # Patterns compiled once for extract_from_text (English is case-insensitive)
+        self._compiled_patterns = {
+            'japanese': _compile_patterns(self.japanese_patterns),
+            'english': _compile_patterns(self.english_patterns, ignore_case=True),
+        }
+        # One fused scan per language decides whether the per-pattern pass is needed
+        self._pattern_gates = {
+            'japanese': _compile_gate(self.japanese_patterns),
+            'english': _compile_gate(self.english_patterns, ignore_case=True),
+        }
     
     async def extract_from_conversation(
         self, 
@@ -167,7 +311,35 @@ class VocabularyExtractor:
         Returns:
             List of vocabulary items
         """
+        return [item async for item in self.iter_from_conversation(transcript, context)]
+    
+    async def iter_from_conversation(
+        self,
+        transcript: str,
+        context: Optional[Dict] = None
+    ) -> AsyncIterator[VocabularyModel]:
+        """
+        Extract vocabulary from a conversation transcript, yielding each item
+        as soon as the streamed AI response completes it
+        
+        Args:
+            transcript: The conversation text
+            context: Optional context (video info, timestamp, etc.)
+            
+        Yields:
+            Vocabulary items
+        """
         try:
+            # Transcripts dominated by known expressions don't need the AI
+            if settings.ENABLE_LOCAL_FASTPATH:
+                target_language = context.get('target_language') if context else None
+                local_items = self._items_from_patterns(transcript, target_language)
+                if len(local_items) >= settings.LOCAL_HIT_THRESHOLD:
+                    self._attach_context(local_items, context)
+                    for item in local_items:
+                        yield item
+                    return
+            
             # Lazy load AI responder to avoid circular import
             if self.ai_responder is None:
                 from app.core.ai_responder import BilingualAIResponder
@@ -247,30 +419,90 @@ class VocabularyExtractor:
                 from app.core.ai_responder import BilingualAIResponder
                 self.ai_responder = BilingualAIResponder()
             
-            response = await asyncio.to_thread(
+            cache_key = hashlib.blake2b(analysis_prompt.encode(), digest_size=16).hexdigest()
+            response_text = self._response_cache.get(cache_key)
+            if response_text is not None:
+                self._response_cache.move_to_end(cache_key)
+                vocabulary_items = await asyncio.to_thread(self._parse_ai_response, response_text)
+                self._attach_context(vocabulary_items, context)
+                for item in vocabulary_items:
+                    yield item
+                return
+            
+            # Stream the response; the blocking SDK iterator is advanced in a thread
+            response_stream = await asyncio.to_thread(
                 self.ai_responder.model.generate_content,
-                analysis_prompt
+                analysis_prompt,
+                stream=True
             )
-            
-            # Parse the response
-            vocabulary_items = self._parse_ai_response(response.text)
-            
-            # Add context information
-            for item in vocabulary_items:
-                if context:
-                    item.source = context.get('source', 'conversation')
-                    item.video_id = context.get('video_id')
-                    item.timestamp = context.get('timestamp')
+            chunks = iter(response_stream)
+            parser = _JsonItemStream()
+            produced = False
+            
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                if not chunk.text:
+                    continue
                 
-                # Generate unique ID
-                item.id = self._generate_vocabulary_id(item.japanese_text, item.english_text)
-                item.created_at = datetime.utcnow()
-            
-            return vocabulary_items
+                for item_data in parser.feed(chunk.text):
+                    vocabulary_items = self._build_vocabulary_items([item_data])
+                    self._attach_context(vocabulary_items, context)
+                    for item in vocabulary_items:
+                        produced = True
+                        yield item
+            
+            # Only remember responses that produced vocabulary
+            if produced:
+                self._response_cache[cache_key] = parser.text
+                if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
             
         except Exception as e:
             logger.error(f"Error extracting vocabulary from conversation: {str(e)}")
-            return []
+    
+    def _items_from_patterns(
+        self,
+        transcript: str,
+        target_language: Optional[str] = None
+    ) -> List[VocabularyModel]:
+        """Build vocabulary items from extract_from_text hits, one per distinct expression"""
+        items = []
+        seen = set()
+        for hit in self.extract_from_text(transcript, target_language):
+            # 'expression' is only the first capture group (e.g. "time" for
+            # "one more time"); the meaning belongs to the whole match
+            expression = hit['match'].strip()
+            key = (hit['language'], expression.lower())
+            if not expression or key in seen:
+                continue
+            seen.add(key)
+            
+            # Pattern meanings are English for Japanese patterns and vice versa
+            is_english = hit['language'] == 'english'
+            items.append(VocabularyModel(
+                japanese_text=hit['meaning'] if is_english else expression,
+                english_text=expression if is_english else hit['meaning'],
+                difficulty_level=hit['difficulty'],
+                context=hit['actual_usage'],
+                tags=[hit['category']],
+                source_language=hit['language']
+            ))
+        return items
+    
+    def _attach_context(self, vocabulary_items: List[VocabularyModel], context: Optional[Dict]) -> None:
+        """Add context information and IDs to freshly extracted items"""
+        now = datetime.utcnow()
+        for item in vocabulary_items:
+            if context:
+                item.source = context.get('source', 'conversation')
+                item.video_id = context.get('video_id')
+                item.timestamp = context.get('timestamp')
+            
+            # Generate unique ID
+            item.id = self._generate_vocabulary_id(item.japanese_text, item.english_text)
+            item.created_at = now
     
     async def extract_from_video(self, video_url: str) -> Dict:
         """
@@ -291,10 +523,19 @@ class VocabularyExtractor:
             
             # Extract vocabulary from expressions found
             vocabulary_items = []
+            seen_ids = set()
+            now = datetime.utcnow()
             
-            # Convert expressions to vocabulary items
+            # Convert expressions to vocabulary items, keeping the first
+            # occurrence of each so repeats aren't enhanced or synced again
             for expr in video_data.get('expressions', []):
+                vocabulary_id = self._generate_vocabulary_id(expr['japanese'], expr.get('english', ''))
+                if vocabulary_id in seen_ids:
+                    continue
+                seen_ids.add(vocabulary_id)
+                
                 vocab_item = VocabularyModel(
+                    id=vocabulary_id,
                     japanese_text=expr['japanese'],
                     english_text=expr.get('english', ''),  # Use provided translation or empty
                     reading='',  # Will be filled by AI
@@ -304,29 +545,27 @@ class VocabularyExtractor:
                     source='youtube',
                     source_video_id=video_data['video_info']['video_id'],
                     video_timestamp=expr['timestamp'],
-                    created_at=datetime.utcnow()
+                    created_at=now
                 )
                 vocabulary_items.append(vocab_item)
             
             # Use AI to enhance vocabulary items
             enhanced_items = await self._enhance_vocabulary_with_ai(vocabulary_items)
             
-            # Save to database and Notion
+            # Sync to Notion first, overlapping the API round trips, so each
+            # item is written to the local database once with its Notion ID
+            if self.notion_service:
+                notion_ids = await self.notion_service.sync_many(enhanced_items)
+                for item, notion_id in zip(enhanced_items, notion_ids):
+                    item.notion_id = notion_id
+            
+            # Save to local database in a single transaction
             saved_items = []
+            synced_at = datetime.utcnow()
             for item in enhanced_items:
-                # Save to local database
-                item_id = await db_service.save_vocabulary_item(item)
-                
-                # Sync to Notion
-                if self.notion_service:
-                    notion_id = await self.notion_service.sync_vocabulary_entry(item)
-                    item.notion_id = notion_id
-                item.synced_at = datetime.utcnow()
-                
-                # Update with Notion ID
-                await db_service.save_vocabulary_item(item)
-                
+                item.synced_at = synced_at
                 saved_items.append(item)
+            await db_service.save_vocabulary_items_bulk(saved_items)
             
             return {
                 "video_info": video_data['video_info'],
@@ -342,71 +581,10 @@ class VocabularyExtractor:
     def _parse_ai_response(self, response_text: str) -> List[VocabularyModel]:
         """Parse AI response to extract vocabulary items"""
         try:
-            # Try to extract JSON from response
-            import json
-            
-            # Find JSON array in response
-            json_match = re.search(r'\[\s*\{.*\}\s*\]', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                items_data = json.loads(json_str)
-                
-                vocabulary_items = []
-                for item_data in items_data:
-                    # Handle both Japanese (N1-N5) and English (A1-C2) difficulty formats
-                    difficulty_str = item_data.get('difficulty', 'N3')
-                    
-                    # Convert difficulty to numeric
-                    if difficulty_str.startswith('N'):
-                        # Japanese JLPT levels
-                        difficulty_map = {'N5': 1, 'N4': 2, 'N3': 3, 'N2': 4, 'N1': 5}
-                        difficulty_level = difficulty_map.get(difficulty_str, 3)
-                    else:
-                        # English CEFR levels
-                        difficulty_map = {'A1': 1, 'A2': 2, 'B1': 3, 'B2': 4, 'C1': 5, 'C2': 6}
-                        difficulty_level = difficulty_map.get(difficulty_str, 3)
-                    
-                    # Determine which field contains the primary expression
-                    if 'english' in item_data and 'japanese' in item_data:
-                        # Both fields present - check which is primary
-                        if item_data.get('english', '').strip() and not item_data.get('japanese', '').strip():
-                            # English is primary
-                            primary_text = item_data.get('english', '')
-                            translation = item_data.get('japanese', '')
-                            language = 'english'
-                        else:
-                            # Japanese is primary (default)
-                            primary_text = item_data.get('japanese', '')
-                            translation = item_data.get('english', '')
-                            language = 'japanese'
-                    else:
-                        # Fallback
-                        primary_text = item_data.get('japanese', '') or item_data.get('english', '')
-                        translation = item_data.get('english', '') or item_data.get('japanese', '')
-                        language = 'japanese' if item_data.get('japanese') else 'english'
-                    
-                    vocab_item = VocabularyModel(
-                        japanese=primary_text if language == 'japanese' else translation,
-                        english=primary_text if language == 'english' else translation,
-                        reading=item_data.get('reading', ''),
-                        difficulty=difficulty_level,
-                        context=item_data.get('context', ''),
-                        example_sentence=item_data.get('actual_usage', item_data.get('context', '')),
-                        tags=[item_data.get('category', 'general')],
-                        notes=item_data.get('notes', ''),
-                        source_language=language,
-                        created_at=datetime.utcnow()
-                    )
-                    
-                    # Add additional metadata if available
-                    if 'frequency' in item_data:
-                        vocab_item.frequency = item_data['frequency']
-                    if 'emotion' in item_data:
-                        vocab_item.emotion = item_data['emotion']
-                    
-                    vocabulary_items.append(vocab_item)
-                
-                return vocabulary_items
+            # Find JSON array of items in response
+            items_data = _find_json_array(response_text, dict)
+            if items_data:
+                return self._build_vocabulary_items(items_data)
             
             return []
             
@@ -414,6 +592,66 @@ class VocabularyExtractor:
             logger.error(f"Error parsing AI response: {str(e)}")
             return []
     
+    def _build_vocabulary_items(self, items_data: List[Dict]) -> List[VocabularyModel]:
+        """Build vocabulary items from parsed AI response entries"""
+        now = datetime.utcnow()
+        vocabulary_items = []
+        for item_data in items_data:
+            # Handle both Japanese (N1-N5) and English (A1-C2) difficulty formats
+            difficulty_str = item_data.get('difficulty', 'N3')
+
+            # Convert difficulty to numeric
+            if difficulty_str.startswith('N'):
+                # Japanese JLPT levels
+                difficulty_map = {'N5': 1, 'N4': 2, 'N3': 3, 'N2': 4, 'N1': 5}
+                difficulty_level = difficulty_map.get(difficulty_str, 3)
+            else:
+                # English CEFR levels
+                difficulty_map = {'A1': 1, 'A2': 2, 'B1': 3, 'B2': 4, 'C1': 5, 'C2': 6}
+                difficulty_level = difficulty_map.get(difficulty_str, 3)
+
+            # Determine which field contains the primary expression
+            if 'english' in item_data and 'japanese' in item_data:
+                # Both fields present - check which is primary
+                if item_data.get('english', '').strip() and not item_data.get('japanese', '').strip():
+                    # English is primary
+                    primary_text = item_data.get('english', '')
+                    translation = item_data.get('japanese', '')
+                    language = 'english'
+                else:
+                    # Japanese is primary (default)
+                    primary_text = item_data.get('japanese', '')
+                    translation = item_data.get('english', '')
+                    language = 'japanese'
+            else:
+                # Fallback
+                primary_text = item_data.get('japanese', '') or item_data.get('english', '')
+                translation = item_data.get('english', '') or item_data.get('japanese', '')
+                language = 'japanese' if item_data.get('japanese') else 'english'
+
+            vocab_item = VocabularyModel(
+                japanese=primary_text if language == 'japanese' else translation,
+                english=primary_text if language == 'english' else translation,
+                reading=item_data.get('reading', ''),
+                difficulty=difficulty_level,
+                context=item_data.get('context', ''),
+                example_sentence=item_data.get('actual_usage', item_data.get('context', '')),
+                tags=[item_data.get('category', 'general')],
+                notes=item_data.get('notes', ''),
+                source_language=language,
+                created_at=now
+            )
+
+            # Add additional metadata if available
+            if 'frequency' in item_data:
+                vocab_item.frequency = item_data['frequency']
+            if 'emotion' in item_data:
+                vocab_item.emotion = item_data['emotion']
+
+            vocabulary_items.append(vocab_item)
+
+        return vocabulary_items
+    
     async def _enhance_vocabulary_with_ai(
         self, 
         items: List[VocabularyModel]
@@ -444,15 +682,8 @@ class VocabularyExtractor:
                 enhancement_prompt
             )
             
-            # Parse response and update items
-            lines = response.text.strip().split('\n')
-            for i, line in enumerate(lines):
-                if i < len(items):
-                    # Parse line format: "1. [japanese] - [english] - [reading]"
-                    match = re.match(r'\d+\.\s*(.+?)\s*-\s*(.+?)\s*-\s*(.+?)$', line)
-                    if match:
-                        items[i].english_text = match.group(2).strip()
-                        items[i].reading = match.group(3).strip()
+            # Parse response and update items off the event loop
+            await asyncio.to_thread(self._apply_enhancements, items, response.text)
             
             return items
             
@@ -460,10 +691,23 @@ class VocabularyExtractor:
             logger.error(f"Error enhancing vocabulary with AI: {str(e)}")
             return items
     
+    @staticmethod
+    def _apply_enhancements(items: List[VocabularyModel], response_text: str) -> None:
+        """Apply "1. [japanese] - [english] - [reading]" lines to the items they number"""
+        for match in _ENHANCEMENT_LINE_RE.finditer(response_text):
+            index = int(match.group(1)) - 1
+            if 0 <= index < len(items):
+                items[index].english_text = match.group(3).strip()
+                items[index].reading = match.group(4).strip()
+    
     def _generate_vocabulary_id(self, japanese: str, english: str) -> str:
         """Generate unique ID for vocabulary item"""
-        content = f"{japanese}:{english}"
-        return hashlib.md5(content.encode()).hexdigest()[:12]
+        # 12 hex chars, as before; BLAKE2b sized to the output instead of md5 + slice
+        h = hashlib.blake2b(digest_size=6)
+        h.update(japanese.encode())
+        h.update(b":")
+        h.update(english.encode())
+        return h.hexdigest()
     
     async def process_youtube_video(self, video_id: str) -> Dict:
         """
@@ -518,23 +762,39 @@ class VocabularyExtractor:
             "errors": []
         }
         
-        for url in video_urls:
-            try:
-                result = await self.extract_from_video(url)
-                if "error" not in result:
-                    results["successful"] += 1
-                    results["total_vocabulary"] += result.get("vocabulary_extracted", 0)
-                else:
-                    results["failed"] += 1
-                    results["errors"].append({
-                        "url": url,
-                        "error": result["error"]
-                    })
-            except Exception as e:
+        # Videos are network bound (YouTube, Gemini, Notion); overlap a few at a time
+        semaphore = asyncio.Semaphore(settings.VIDEO_CONCURRENCY or 5)
+        
+        async def extract_one(url: str) -> Dict:
+            async with semaphore:
+                for attempt in range(_VIDEO_ATTEMPTS):
+                    result = await self.extract_from_video(url)
+                    if "error" not in result or not _is_rate_limited(str(result["error"])):
+                        return result
+                    if attempt + 1 < _VIDEO_ATTEMPTS:
+                        await asyncio.sleep(2 ** attempt)
+                return result
+        
+        outcomes = await asyncio.gather(
+            *(extract_one(url) for url in video_urls),
+            return_exceptions=True
+        )
+        
+        for url, result in zip(video_urls, outcomes):
+            if isinstance(result, Exception):
+                results["failed"] += 1
+                results["errors"].append({
+                    "url": url,
+                    "error": str(result)
+                })
+            elif "error" not in result:
+                results["successful"] += 1
+                results["total_vocabulary"] += result.get("vocabulary_extracted", 0)
+            else:
                 results["failed"] += 1
                 results["errors"].append({
                     "url": url,
-                    "error": str(e)
+                    "error": result["error"]
                 })
         
         return results
@@ -542,10 +802,10 @@ class VocabularyExtractor:
     def detect_language(self, text: str) -> str:
         """Detect the primary language of the text"""
         # Count Japanese characters (Hiragana, Katakana, Kanji)
-        japanese_chars = len(re.findall(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', text))
+        japanese_chars = _JAPANESE_CHARS_RE.subn('', text)[1]
         # Count Latin alphabet characters
-        english_chars = len(re.findall(r'[a-zA-Z]', text))
-        total_chars = len(re.sub(r'\s', '', text))
+        english_chars = _LATIN_CHARS_RE.subn('', text)[1]
+        total_chars = len(text) - _WHITESPACE_RE.subn('', text)[1]
         
         if total_chars == 0:
             return 'unknown'
@@ -563,73 +823,70 @@ class VocabularyExtractor:
     
     def extract_from_text(self, text: str, target_language: Optional[str] = None) -> List[Dict]:
         """Quick extraction using pattern matching (no AI) with priority scoring"""
-        expressions = []
+        expressions = list(self.iter_from_text(text, target_language))
         
+        # Sort by priority (higher priority first)
+        expressions.sort(key=lambda x: x.get('priority', 0), reverse=True)
+        
+        return expressions
+    
+    def iter_from_text(self, text: str, target_language: Optional[str] = None) -> Iterator[Dict]:
+        """Yield pattern matches lazily, in pattern order (extract_from_text sorts them by priority)"""
         # Auto-detect language if not specified
         if target_language is None:
             detected_lang = self.detect_language(text)
             if detected_lang == 'japanese':
-                pattern_sets = {'japanese': self.japanese_patterns}
+                languages = ('japanese',)
             elif detected_lang == 'english':
-                pattern_sets = {'english': self.english_patterns}
+                languages = ('english',)
             else:  # mixed
-                pattern_sets = {'japanese': self.japanese_patterns, 'english': self.english_patterns}
+                languages = ('japanese', 'english')
         else:
             if target_language == 'japanese':
-                pattern_sets = {'japanese': self.japanese_patterns}
+                languages = ('japanese',)
             elif target_language == 'english':
-                pattern_sets = {'english': self.english_patterns}
+                languages = ('english',)
             else:
-                pattern_sets = {'japanese': self.japanese_patterns, 'english': self.english_patterns}
+                languages = ('japanese', 'english')
+        
+        context = text[:100]  # First 100 chars as context
         
         # Extract from appropriate pattern sets
-        for lang, patterns_dict in pattern_sets.items():
-            for category, patterns in patterns_dict.items():
-                for pattern_data in patterns:
-                    # Handle new pattern format with priority
-                    if len(pattern_data) == 4:
-                        pattern, meaning, difficulty, priority = pattern_data
-                    else:
-                        pattern, meaning = pattern_data
-                        difficulty = 3  # Numeric value for N3/B1 level
-                        priority = 5
+        for lang in languages:
+            # Per-pattern matches can overlap (e.g. "thanks" inside "thanks for
+            # watching"), so the fused regex only screens out texts with no hits
+            if not self._pattern_gates[lang].search(text):
+                continue
+            
+            # Split (and lowercase) the sentences once per language, not per match
+            sentences = [
+                (sentence.lower(), sentence)
+                for sentence in _SENTENCE_SPLIT_RE[lang].split(text)
+            ]
+            
+            for regex, category, meaning, difficulty, priority in self._compiled_patterns[lang]:
+                # Like findall, report the first group when the pattern has one
+                has_groups = regex.groups > 0
+                
+                for match in regex.finditer(text):
+                    match_text = (match.group(1) or '') if has_groups else match.group(0)
                     
-                    # Use case-insensitive matching for English
-                    if lang == 'english':
-                        matches = re.findall(pattern, text, re.IGNORECASE)
-                    else:
-                        matches = re.findall(pattern, text)
+                    # Find the full sentence containing this match
+                    match_lower = match_text.lower()
+                    actual_usage = ""
+                    for sentence_lower, sentence in sentences:
+                        if match_lower in sentence_lower:
+                            actual_usage = sentence.strip()
+                            break
                     
-                    for match in matches:
-                        # Find the full sentence containing this match
-                        if lang == 'japanese':
-                            sentences = re.split(r'[。！？\n]', text)
-                        else:
-                            sentences = re.split(r'[.!?\n]', text)
-                        
-                        actual_usage = ""
-                        for sentence in sentences:
-                            if isinstance(match, tuple):
-                                match_text = match[0] if match else ''
-                            else:
-                                match_text = match
-                            
-                            if match_text.lower() in sentence.lower():
-                                actual_usage = sentence.strip()
-                                break
-                        
-                        expressions.append({
-                            "expression": match if isinstance(match, str) else match[0],
-                            "category": category,
-                            "meaning": meaning,
-                            "difficulty": difficulty,
-                            "priority": priority,
-                            "language": lang,
-                            "context": text[:100],  # First 100 chars as context
-                            "actual_usage": actual_usage,  # Full sentence where it was used
-                        })
-        
-        # Sort by priority (higher priority first)
-        expressions.sort(key=lambda x: x.get('priority', 0), reverse=True)
-        
-        return expressions
\ No newline at end of file
+                    yield {
+                        "expression": match_text,
+                        "match": match.group(0),
+                        "category": category,
+                        "meaning": meaning,
+                        "difficulty": difficulty,
+                        "priority": priority,
+                        "language": lang,
+                        "context": context,
+                        "actual_usage": actual_usage,  # Full sentence where it was used
+                    }
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Tests for Azure recognizer pooling and per-client locking
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.speech.azure_provider import _POOL_MAX_TOTAL, AzureSpeechProvider
+
+
+class FakeSignal:
+    def __init__(self):
+        self.handlers = []
+
+    def connect(self, handler):
+        self.handlers.append(handler)
+
+    def disconnect_all(self):
+        self.handlers.clear()
+
+
+class FakeRecognizer:
+    def __init__(self, language):
+        self.language = language
+        self.recognized = FakeSignal()
+        self.recognizing = FakeSignal()
+        self.running = False
+
+    def start_continuous_recognition(self):
+        self.running = True
+
+    def stop_continuous_recognition(self):
+        self.running = False
+
+
+def make_provider():
+    provider = AzureSpeechProvider()
+    provider.speech_config = object()
+    provider.created = []
+
+    def create_recognizer(language):
+        recognizer = FakeRecognizer(language)
+        provider.created.append(recognizer)
+        return recognizer
+
+    provider._create_recognizer = create_recognizer
+    return provider
+
+
+def bound_clients(recognizer):
+    return {handler.args[0] for handler in recognizer.recognized.handlers + recognizer.recognizing.handlers}
+
+
+class TestAzureSpeechProvider:
+    @pytest.mark.asyncio
+    async def test_stopped_recognizer_is_detached_and_reused(self):
+        provider = make_provider()
+
+        assert await provider.start_recognition("alice", "ja")
+        recognizer = provider._recognizers["alice"]
+        assert recognizer.running and bound_clients(recognizer) == {"alice"}
+
+        await provider.stop_recognition("alice")
+        assert not recognizer.running
+        assert bound_clients(recognizer) == set()
+
+        # Same configuration under another spelling reuses the pooled recognizer
+        assert await provider.start_recognition("bob", "ja-JP")
+        assert provider._recognizers["bob"] is recognizer
+        assert bound_clients(recognizer) == {"bob"}
+        assert len(provider.created) == 1
+
+    @pytest.mark.asyncio
+    async def test_pool_keys_and_size_are_bounded(self):
+        provider = make_provider()
+        clients = [f"client{i}" for i in range(20)]
+
+        for i, client_id in enumerate(clients):
+            assert await provider.start_recognition(client_id, f"xx-{i}" if i % 2 else "en")
+        assert {r.language for r in provider.created} == {"auto", "en-US"}
+
+        for client_id in clients:
+            await provider.stop_recognition(client_id)
+        assert set(provider._pool) <= {("auto", True), ("en-US", False)}
+        assert sum(len(pool) for pool in provider._pool.values()) == provider._pool_size
+        assert provider._pool_size <= _POOL_MAX_TOTAL
+
+    @pytest.mark.asyncio
+    async def test_shutdown_stops_recognizers_and_empties_pool(self):
+        provider = make_provider()
+        await provider.start_recognition("alice", "auto")
+        await provider.start_recognition("bob", "en")
+        await provider.stop_recognition("bob")
+        running = provider._recognizers["alice"]
+
+        provider.shutdown()
+
+        assert not running.running and bound_clients(running) == set()
+        assert provider._recognizers == {} and provider._pool == {}
+        assert provider._pool_size == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_start_does_not_block_other_clients(self):
+        provider = make_provider()
+        create_recognizer = provider._create_recognizer
+        release = threading.Event()
+
+        def slow_create(language):
+            if language == "ja-JP":
+                release.wait(5)
+            return create_recognizer(language)
+
+        provider._create_recognizer = slow_create
+        slow = asyncio.create_task(provider.start_recognition("alice", "ja"))
+        await asyncio.sleep(0.05)
+
+        assert await asyncio.wait_for(provider.start_recognition("bob", "en"), 1)
+        assert not slow.done()
+
+        release.set()
+        assert await slow
+        # Locks are dropped once no start/stop holds them
+        assert len(provider._locks) == 0
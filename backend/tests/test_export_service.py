@@ -0,0 +1,55 @@
+"""
+Tests for vocabulary export helpers
+"""
+
+import csv
+import io
+import json
+
+from app.services.export_service import (
+    _ANKI_MODELS,
+    _build_anki_card,
+    _build_anki_note,
+    _serialize_anki_collection,
+    _write_csv_rows,
+)
+
+
+class TestAnkiCollectionSerialization:
+    def test_matches_full_json_dumps(self):
+        deck_id = 1700000000000
+        mod_ts = 1700000000
+        items = [
+            {'japanese_text': 'てぇてぇ', 'english_text': 'precious', 'difficulty_level': 4},
+            {'japanese_text': '草', 'english_text': 'lol', 'source_video_id': 'abc', 'video_timestamp': 12.5},
+        ]
+        notes = [_build_anki_note(deck_id, idx, item, mod_ts) for idx, item in enumerate(items)]
+        cards = [_build_anki_card(note, idx, deck_id, mod_ts) for idx, note in enumerate(notes)]
+        decks = {str(deck_id): {"name": "Test", "id": deck_id, "mod": mod_ts}}
+
+        payload = _serialize_anki_collection(decks, notes, cards)
+
+        expected = {"decks": decks, "notes": notes, "cards": cards, "models": _ANKI_MODELS}
+        assert payload == json.dumps(expected)
+        assert json.loads(payload)["cards"][1]["nid"] == notes[1]["id"]
+
+    def test_note_links_source_video(self):
+        note = _build_anki_note(1, 0, {'source_video_id': 'abc', 'video_timestamp': 12.5}, 0)
+        assert "https://www.youtube.com/watch?v=abc&t=12s" in note["flds"][1]
+
+
+class TestCsvRowWriter:
+    def test_matches_csv_writer(self):
+        rows = [
+            ['てぇてぇ', 'precious', None, '', 4, 'youtube', 'abc', 12.5, '2024-01-01'],
+            ['草', 'lol, grass', 'くさ', 'say "草"', 1, None, None, None, 'x'],
+            ['multi\nline', 'a\rb', '', '', '', '', '', '', ''],
+        ]
+        expected = io.StringIO()
+        csv.writer(expected).writerows(rows)
+
+        output = io.StringIO()
+        _write_csv_rows(output, csv.writer(output), rows)
+
+        assert output.getvalue() == expected.getvalue()
+        assert list(csv.reader(io.StringIO(output.getvalue())))[1][1] == 'lol, grass'
@@ -0,0 +1,80 @@
+"""
+Tests for the NLP extractor's Redis result cache
+"""
+
+from app.services.nlp_vocabulary_extractor import NLPVocabularyExtractor
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for the hash-bucket cache, with TTLs set by hand"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+
+    def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key] = value
+
+    def hget(self, name, key):
+        return self.hashes.get(name, {}).get(key)
+
+    def hdel(self, name, key):
+        self.hashes.get(name, {}).pop(key, None)
+
+    def ttl(self, name):
+        if name not in self.hashes:
+            return -2
+        return self.ttls.get(name, -1)
+
+    def expire(self, name, seconds):
+        self.ttls[name] = seconds
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((getattr(self.client, name), args))
+
+    def execute(self):
+        return [method(*args) for method, args in self.calls]
+
+
+def make_extractor():
+    extractor = NLPVocabularyExtractor.__new__(NLPVocabularyExtractor)
+    extractor.cache = FakeRedis()
+    extractor.cache_ttl = 100
+    return extractor
+
+
+class TestCacheBuckets:
+    def test_round_trip(self):
+        extractor = make_extractor()
+        key = extractor._generate_cache_key("no problem", "english")
+        data = [{"expression": "no problem", "level": "A2"}]
+
+        extractor._save_to_cache(key, data)
+
+        assert extractor._get_from_cache(key) == data
+
+    def test_bucket_ttl_is_only_set_on_creation(self):
+        extractor = make_extractor()
+        cache = extractor.cache
+        # Same 4-digit prefix, so both land in one bucket
+        first_key, second_key = "nlp_vocab:abcd0001", "nlp_vocab:abcd0002"
+
+        extractor._save_to_cache(first_key, [{"expression": "one"}])
+        bucket, _ = extractor._cache_bucket(first_key)
+        assert cache.ttls == {bucket: 100}
+
+        # Later writes must not push the bucket's expiry forward
+        cache.ttls[bucket] = 40
+        extractor._save_to_cache(second_key, [{"expression": "two"}])
+        extractor._save_to_cache(first_key, [{"expression": "one again"}])
+        assert cache.ttls == {bucket: 40}
+        assert len(cache.hashes[bucket]) == 2
@@ -0,0 +1,63 @@
+"""
+Tests for in-memory session management
+"""
+
+import pytest
+
+from app.services import session_manager as session_manager_module
+from app.services.session_manager import SessionManager
+
+
+class TestSessionManager:
+    @pytest.mark.asyncio
+    async def test_mutations_persist_in_session_store(self):
+        manager = SessionManager()
+        session_id = await manager.create_session()
+
+        await manager.update_context(session_id, "こんにちは", "Hello!")
+        await manager.set_preference(session_id, "language", "ja")
+
+        context = await manager.get_context(session_id)
+        assert context['conversation_history'] == "User: こんにちは\nAI: Hello!"
+        assert context['turn_count'] == 1
+        assert context['language_preference'] == "ja"
+
+        await manager.reset_context(session_id)
+        context = await manager.get_context(session_id)
+        assert context['conversation_history'] == ""
+        assert context['turn_count'] == 0
+
+    @pytest.mark.asyncio
+    async def test_history_keeps_last_ten_turns(self):
+        manager = SessionManager()
+        session_id = await manager.create_session()
+
+        for turn in range(15):
+            await manager.update_context(session_id, f"q{turn}", f"a{turn}")
+
+        lines = (await manager.get_context(session_id))['conversation_history'].split('\n')
+        assert len(lines) == 20
+        assert lines[0] == "User: q5"
+        assert lines[-1] == "AI: a14"
+
+    @pytest.mark.asyncio
+    async def test_expiry_heap_is_drained(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(session_manager_module.time, 'time', lambda: clock[0])
+        manager = SessionManager()
+
+        for _ in range(100):
+            await manager.end_session(await manager.create_session())
+        kept = await manager.create_session()
+        assert len(manager._expiry_heap) == 101
+
+        # Once the ended sessions' TTL passes, the next create drops their entries
+        clock[0] += manager.session_ttl + 1
+        latest = await manager.create_session()
+        assert manager._expiry_heap == [(clock[0] + manager.session_ttl, latest)]
+        assert kept not in manager.sessions
+
+        clock[0] += manager.session_ttl + 1
+        await manager.cleanup_expired_sessions()
+        assert manager._expiry_heap == []
+        assert manager.sessions == {}
@@ -0,0 +1,39 @@
+"""
+Tests for SM-2 scheduling
+"""
+
+from datetime import datetime, timedelta
+
+from app.services.spaced_repetition import (
+    batch_calculate_next_review,
+    batch_retention_score,
+    calculate_next_review,
+    calculate_retention_score,
+)
+
+
+class TestBatchCalculateNextReview:
+    def test_matches_single_card_calculation(self):
+        cards = [(2.5, 0, 4), (2.5, 1, 5), (2.36, 6, 3), (1.3, 15, 2), (2.7, 10, 5), (2.5, 4, 0)]
+
+        new_efs, new_intervals, next_dates = batch_calculate_next_review(*zip(*cards))
+
+        for (ef, interval, quality), batch_ef, batch_interval in zip(cards, new_efs, new_intervals):
+            expected_ef, expected_interval, _ = calculate_next_review(ef, interval, quality)
+            assert abs(batch_ef - expected_ef) < 1e-9
+            assert batch_interval == expected_interval
+        assert len(next_dates) == len(cards)
+
+    def test_empty_batch(self):
+        assert batch_calculate_next_review([], [], []) == ([], [], [])
+
+
+class TestBatchRetentionScore:
+    def test_matches_single_item_calculation(self):
+        now = datetime.utcnow()
+        items = [(0, 0, None), (4, 3, None), (4, 3, now - timedelta(days=14)), (10, 10, now - timedelta(days=90)), (0, 0, now)]
+
+        scores = batch_retention_score(*zip(*items))
+
+        for (reviews, correct, last), score in zip(items, scores):
+            assert abs(score - calculate_retention_score(reviews, correct, last)) < 1e-9
@@ -0,0 +1,112 @@
+"""
+Tests for vocabulary extraction helpers
+"""
+
+from app.models.vocabulary import VocabularyModel
+from app.services.vocabulary_extractor import (
+    _ENHANCEMENT_LINE_RE,
+    VocabularyExtractor,
+    _find_json_array,
+    _JsonItemStream,
+)
+
+RESPONSE_ITEMS = """[
+    {"japanese": "{ここ}", "english": "here } there", "notes": "braces {} in \\"strings\\""},
+    {"japanese": "すごい", "english": "amazing", "difficulty": 2},
+    {"japanese": "[配列]", "english": "array, {nested: no}"}
+]"""
+
+
+def stream_items(text, chunk_size):
+    """Feed text to a _JsonItemStream in fixed-size chunks and collect every item"""
+    stream = _JsonItemStream()
+    items = []
+    for start in range(0, len(text), chunk_size):
+        items.extend(stream.feed(text[start:start + chunk_size]))
+    return items
+
+
+class TestJsonItemStream:
+    def assert_matches_full_parse(self, text):
+        expected = _find_json_array(text, dict)
+        assert expected
+        for chunk_size in range(1, len(text) + 1):
+            assert stream_items(text, chunk_size) == expected, chunk_size
+
+    def test_objects_split_across_chunks(self):
+        self.assert_matches_full_parse(RESPONSE_ITEMS)
+
+    def test_prose_and_code_fences_before_array(self):
+        self.assert_matches_full_parse(
+            "Here are the expressions [as requested]:\n```json\n" + RESPONSE_ITEMS + "\n```"
+        )
+
+    def test_text_after_closing_bracket_is_ignored(self):
+        text = RESPONSE_ITEMS + '\nExtra: {"japanese": "無視", "english": "ignored"}'
+        self.assert_matches_full_parse(text)
+        assert len(stream_items(text, 7)) == 3
+
+    def test_no_array(self):
+        assert stream_items("Sorry, I found no expressions {}.", 4) == []
+
+
+class TestFindJsonArray:
+    def test_skips_arrays_of_other_types(self):
+        text = 'Notes ["a", "b"] then [{"english": "hi"}] and [{"english": "later"}]'
+        assert _find_json_array(text, dict) == [{"english": "hi"}]
+        assert _find_json_array(text, str) == ["a", "b"]
+
+    def test_skips_invalid_and_empty_arrays(self):
+        text = '[not json] [] [[1], [2]] [{"english": "ok"}]'
+        assert _find_json_array(text, list) == [[1], [2]]
+        assert _find_json_array(text, dict) == [{"english": "ok"}]
+
+    def test_returns_none_without_match(self):
+        assert _find_json_array("no arrays here", dict) is None
+        assert _find_json_array('[{"english": "cut off"', dict) is None
+
+
+class TestItemsFromPatterns:
+    def test_english_pairs_use_full_match(self):
+        extractor = VocabularyExtractor()
+        transcript = (
+            "Hey guys, welcome back! Good game, gg. One more time! Nice shot. "
+            "I'm sorry. See you later. Don't forget to subscribe."
+        )
+
+        items = extractor._items_from_patterns(transcript, 'english')
+        pairs = {item.english_text: item.japanese_text for item in items}
+
+        assert pairs["Good game"] == 'お疲れ様/ナイスゲーム'
+        assert pairs["gg"] == 'お疲れ様/ナイスゲーム'
+        assert pairs["One more time"] == 'もう一回'
+        assert pairs["Nice shot"] == 'ナイスプレイ'
+        assert pairs["I'm sorry"] == 'すみません/ごめんなさい'
+        assert pairs["Hey guys"] == 'みなさん'
+        assert pairs["See you later"] == 'また今度/またね'
+        assert pairs["Don't forget to subscribe"] == 'チャンネル登録お願いします'
+        # Capture groups alone never become expressions
+        assert not {"time", "game", "shot", "I'm", "Hey", "later", "subscribe"} & pairs.keys()
+        assert all(item.source_language == 'english' for item in items)
+
+
+class TestEnhancementLines:
+    def test_numbering(self):
+        text = "1. すごい - amazing - スゴイ\n\n3. やばい - crazy - yabai\nnot a line\n10. x - y - z"
+        matches = [match.groups() for match in _ENHANCEMENT_LINE_RE.finditer(text)]
+        assert matches == [
+            ('1', 'すごい', 'amazing', 'スゴイ'),
+            ('3', 'やばい', 'crazy', 'yabai'),
+            ('10', 'x', 'y', 'z'),
+        ]
+
+    def test_apply_enhancements_by_number(self):
+        items = [VocabularyModel(japanese_text=text, english_text="") for text in ("すごい", "草", "やばい")]
+
+        VocabularyExtractor._apply_enhancements(
+            items, "3. やばい - crazy - ヤバイ\n1. すごい - amazing - スゴイ\n4. 余分 - extra - ヨブン"
+        )
+
+        assert [(item.english_text, item.reading) for item in items] == [
+            ("amazing", "スゴイ"), ("", None), ("crazy", "ヤバイ")
+        ]